@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+__title__   = "Auto Dim View"
+__doc__     = """Version = 1.0
+Date    = 17.10.2026
+________________________________________________________________
+Description:
+Dimension every straight wall in the active plan view:
+wall-to-wall and overall strings per parallel wall family,
+and an opening string for every wall with doors/windows.
+Strings sharing space are packed onto separate offsets.
+________________________________________________________________
+Author: Zwe"""
+
+from pyrevit import revit, script
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI import TaskDialog
+import time
+
+from Geometry._cluster import group_by_direction
+from Geometry._layout import layout_lanes, place_offsets
+from Snippets._dimensions import (wall_direction, plan_normal, collect_refs, to_reference_array,
+                                  string_line, set_view_sketch_plane,
+                                  get_dimension_type, remember_dimension_type)
+
+doc = revit.doc
+uidoc = revit.uidoc
+view = uidoc.ActiveView
+output = script.get_output()
+
+config = script.get_config()
+merge_tolerance = float(config.get_option("merge_tolerance_mm", 1.0)) / 304.8
+STRING_SPACING = 800 / 304.8    # ft between stacked strings
+STRING_MARGIN = 1200 / 304.8    # ft from the wall / family extent to the first string
+
+start_time = time.time()
+
+# --- Step 1: Collect straight walls in the view
+walls = [w for w in FilteredElementCollector(doc, view.Id).OfClass(Wall).WhereElementIsNotElementType()
+         if wall_direction(w)]
+if not walls:
+    TaskDialog.Show("AutoDim", "No straight walls in the active view.")
+    script.exit()
+
+def direction_tuple(wall):
+    d = wall_direction(wall)
+    return (d.X, d.Y)
+
+families = group_by_direction(walls, direction_tuple)
+
+# --- Step 2: Plan strings
+# Each planned string: (lane, lo, hi, ref_data, axis, through, offset_dir)
+#   lane    (angle, "outer") for family strings, (angle, "opening", side) for opening strings
+#   lo/hi   span on the measuring axis (used for packing)
+#   through nearest position of the string, offset_dir moves it further out
+planned = []
+
+for angle, fam_walls in families:
+    d = wall_direction(fam_walls[0])
+    n = plan_normal(d)
+    z = min(w.Location.Curve.GetEndPoint(0).Z for w in fam_walls)
+
+    # Wall-to-wall and overall strings run along n, outside the family extent on +d
+    ref_data = collect_refs(doc, [(w, plan_normal(wall_direction(w))) for w in fam_walls], n, merge_tolerance)
+    if len(ref_data) >= 2:
+        far = max(max(w.Location.Curve.GetEndPoint(i).DotProduct(d) for i in (0, 1)) for w in fam_walls)
+        through = d * (far + STRING_MARGIN) + XYZ(0, 0, z)
+        lane = (angle, "outer")
+        planned.append((lane, ref_data[0][0], ref_data[-1][0], ref_data, n, through, d))
+        if len(ref_data) > 2:
+            overall = [ref_data[0], ref_data[-1]]
+            planned.append((lane, ref_data[0][0] - STRING_SPACING, ref_data[-1][0] + STRING_SPACING,
+                            overall, n, through, d))
+
+    # Opening strings run along d, beside each wall that has inserts
+    for wall in fam_walls:
+        inserts = [doc.GetElement(i) for i in wall.FindInserts(True, False, False, False)]
+        inserts = [i for i in inserts if i]
+        if not inserts:
+            continue
+        sources = [(wall, d)] + [(i, d) for i in inserts]
+        ref_data = collect_refs(doc, sources, d, merge_tolerance)
+        if len(ref_data) < 3:
+            continue
+        mid = wall.Location.Curve.Evaluate(0.5, True)
+        side = mid.DotProduct(n) + wall.Width / 2 + STRING_MARGIN
+        through = XYZ(mid.X, mid.Y, z) + n * (side - mid.DotProduct(n))
+        lane = (angle, "opening", side)
+        planned.append((lane, ref_data[0][0], ref_data[-1][0], ref_data, d, through, n))
+
+if not planned:
+    TaskDialog.Show("AutoDim", "Not enough wall faces found for dimensioning.")
+    script.exit()
+
+# --- Step 3: Pack strings onto separate offsets
+# Family strings stack in their own lane; opening strings of one family are
+# placed at the nearest offset past their wall that clears every overlapping string
+shifts = [0.0] * len(planned)
+outer = [i for i, p in enumerate(planned) if p[0][1] == "outer"]
+tracks = layout_lanes([(planned[i][0], planned[i][1] - 2, planned[i][2] + 2) for i in outer],
+                      clearance=STRING_SPACING)
+for i, track in zip(outer, tracks):
+    shifts[i] = track * STRING_SPACING
+openings_by_angle = {}
+for i, p in enumerate(planned):
+    if p[0][1] == "opening":
+        openings_by_angle.setdefault(p[0][0], []).append(i)
+for indexes in openings_by_angle.values():
+    offsets = place_offsets([(planned[i][1] - 2, planned[i][2] + 2, planned[i][0][2]) for i in indexes],
+                            clearance=STRING_SPACING)
+    for i, offset in zip(indexes, offsets):
+        shifts[i] = offset - planned[i][0][2]
+
+# --- Step 4: Get dimension type
+dim_type = get_dimension_type(doc)
+if not dim_type:
+    TaskDialog.Show("AutoDim", "No linear dimension types found.")
+    script.exit()
+
+# --- Step 5: Create every string in one transaction
+created = 0
+failures = 0
+with revit.Transaction("Auto Dimension View"):
+    for (lane, lo, hi, ref_data, axis, through, offset_dir), shift in zip(planned, shifts):
+        origin = through + offset_dir * shift
+        set_view_sketch_plane(doc, view, origin.Z)
+        try:
+            dim_line = string_line(ref_data[0][0], ref_data[-1][0], axis, origin)
+            doc.Create.NewDimension(view, dim_line, to_reference_array(ref_data), dim_type)
+            created += 1
+        except Exception:
+            failures += 1
+
+if created:
+    remember_dimension_type(doc, dim_type)
+
+print("✅ {} dimension strings created for {} walls in {:.1f}s.".format(
+    created, len(walls), time.time() - start_time))
+if failures:
+    print("❌ {} strings could not be created.".format(failures))
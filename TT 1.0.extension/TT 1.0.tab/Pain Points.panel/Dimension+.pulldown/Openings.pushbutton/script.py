@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+__title__   = "Openings"
+__doc__     = """Version = 1.0
+Date    = 17.10.2026
+________________________________________________________________
+Description:
+Dimension the doors and windows of the selected walls.
+One string per wall, along its exterior face, from wall end
+to wall end through each opening's named family references
+(left/right, or centre).
+________________________________________________________________
+Author: Zwe"""
+
+from pyrevit import revit, forms, script
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI.Selection import ObjectType
+from Autodesk.Revit.UI import TaskDialog
+
+from Geometry._cluster import dedupe_references
+from Snippets._dimensions import (wall_direction, insert_named_refs, to_reference_array,
+                                  string_line, set_view_sketch_plane,
+                                  get_dimension_type, remember_dimension_type)
+from Snippets._facecache import faces_along
+from Snippets._walls import inserts_by_host
+
+doc = revit.doc
+uidoc = revit.uidoc
+view = uidoc.ActiveView
+output = script.get_output()
+
+config = script.get_config()
+merge_tolerance = float(config.get_option("merge_tolerance_mm", 1.0)) / 304.8
+STRING_MARGIN = 1200 / 304.8  # ft outside the exterior face
+
+# --- Step 1: Select walls
+walls = [doc.GetElement(eid) for eid in uidoc.Selection.GetElementIds()]
+walls = [w for w in walls if isinstance(w, Wall) and wall_direction(w)]
+if not walls:
+    try:
+        refs = uidoc.Selection.PickObjects(ObjectType.Element, "Select walls")
+    except:
+        script.exit()
+    walls = [doc.GetElement(r) for r in refs]
+    walls = [w for w in walls if isinstance(w, Wall) and wall_direction(w)]
+if not walls:
+    TaskDialog.Show("AutoDim", "No straight walls selected.")
+    script.exit()
+
+mode = forms.CommandSwitchWindow.show(["Opening Widths", "Opening Centres"],
+                                      message="Dimension openings by:")
+if not mode:
+    script.exit()
+kinds = ("Left", "Right") if mode == "Opening Widths" else ("CenterLeftRight",)
+
+# --- Step 2: All inserts of all selected walls in one pass
+inserts = inserts_by_host(doc, [w.Id for w in walls])
+
+# --- Step 3: Plan one string per wall
+plans = []
+skipped = []
+for wall in walls:
+    wall_inserts = inserts.get(wall.Id.IntegerValue, [])
+    if not wall_inserts:
+        continue
+    d = wall_direction(wall)
+
+    # Wall ends: outermost faces parallel to the wall direction
+    ends = sorted(((f.point.DotProduct(d), f.reference, f.point) for f in faces_along(doc, wall, d)),
+                  key=lambda x: x[0])
+    if len(ends) < 2:
+        skipped.append((wall.Id, "No wall end faces found."))
+        continue
+    ref_data = [ends[0], ends[-1]]
+
+    for insert in wall_inserts:
+        named = insert_named_refs(insert, d, kinds)
+        if not named:
+            # Family without named references or a width: fall back to its faces
+            named = [(f.point.DotProduct(d), f.reference, f.point) for f in faces_along(doc, insert, d)]
+        ref_data.extend(named)
+
+    ref_data = dedupe_references(ref_data, merge_tolerance)
+    mid = wall.Location.Curve.Evaluate(0.5, True)
+    through = mid + wall.Orientation * (wall.Width / 2 + STRING_MARGIN)
+    plans.append((wall, string_line(ref_data[0][0], ref_data[-1][0], d, through), to_reference_array(ref_data)))
+
+if not plans:
+    TaskDialog.Show("AutoDim", "No openings found on the selected walls.")
+    script.exit()
+
+# --- Step 4: Get dimension type
+dim_type = get_dimension_type(doc)
+if not dim_type:
+    TaskDialog.Show("AutoDim", "No linear dimension types found.")
+    script.exit()
+
+# --- Step 5: Create every string in one transaction
+created = 0
+failures = list(skipped)
+with revit.Transaction("Dimension Openings"):
+    for wall, dim_line, ref_array in plans:
+        try:
+            set_view_sketch_plane(doc, view, dim_line.GetEndPoint(0).Z)
+            doc.Create.NewDimension(view, dim_line, ref_array, dim_type)
+            created += 1
+        except Exception as e:
+            failures.append((wall.Id, str(e)))
+
+if created:
+    remember_dimension_type(doc, dim_type)
+
+print("✅ {} opening strings created.".format(created))
+if failures:
+    print("❌ {} wall(s) failed:".format(len(failures)))
+    for wall_id, message in failures:
+        print("{} {}".format(output.linkify(wall_id), message))
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+__title__   = "Purge Sketch Planes"
+__doc__     = """Version = 1.0
+Date    = 17.10.2026
+________________________________________________________________
+Description:
+Delete the unnamed horizontal sketch planes that Dimension+
+runs (this and earlier versions) left behind and that nothing
+depends on. Level and named work planes, and planes that are
+current in a view, are never touched.
+________________________________________________________________
+Author: Zwe"""
+
+from pyrevit import revit, forms, script
+from Autodesk.Revit.DB import *
+from System.Collections.Generic import List
+
+from Snippets._dimensions import is_loose_sketch_plane
+
+doc = revit.doc
+output = script.get_output()
+
+# --- Step 1: Work planes still current in a view
+in_use = set()
+for v in FilteredElementCollector(doc).OfClass(View):
+    try:
+        sp = v.SketchPlane
+    except:
+        sp = None
+    if sp is not None:
+        in_use.add(sp.Id.IntegerValue)
+
+# --- Step 2: Unnamed horizontal planes, as Dimension+ creates, with no dependents
+unused = []
+for sp in FilteredElementCollector(doc).OfClass(SketchPlane):
+    if sp.Id.IntegerValue in in_use or not is_loose_sketch_plane(sp):
+        continue
+    dependents = [d for d in sp.GetDependentElements(None) if d != sp.Id]
+    if not dependents:
+        unused.append(sp.Id)
+
+if not unused:
+    forms.alert("No unused sketch planes found.")
+    script.exit()
+
+if forms.alert("Delete {} unused sketch planes?".format(len(unused)), options=['Yes', 'No']) != 'Yes':
+    script.exit()
+
+# --- Step 3: Delete
+with revit.Transaction("Purge Sketch Planes"):
+    doc.Delete(List[ElementId](unused))
+
+forms.alert("✅ Deleted {} sketch planes.".format(len(unused)))
@@ -9,192 +9,159 @@ Description:
 ________________________________________________________________
 Author: Zwe"""
 
-from pyrevit import revit, script
+from pyrevit import revit, forms, script
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI.Selection import ObjectType
 from Autodesk.Revit.UI import TaskDialog
 import traceback
 
+from Snippets._dimensions import (set_view_sketch_plane, get_dimension_type,
+                                  remember_dimension_type)
+from Snippets._facecache import faces_along
+from Snippets._walls import find_joined_walls, get_wall_index, wall_curve
+
 
 doc = revit.doc
 uidoc = revit.uidoc
 view = uidoc.ActiveView
-
-# --- Step 1: Select a wall
-try:
-    ref = uidoc.Selection.PickObject(ObjectType.Element, "Select one wall")
-    wall = doc.GetElement(ref)
-    if not isinstance(wall, Wall):
-        TaskDialog.Show("AutoDim", "Selected element is not a wall.")
+output = script.get_output()
+
+# --- Step 1: Select walls (pre-selection, one picked wall, or every wall in the view)
+walls = [doc.GetElement(eid) for eid in uidoc.Selection.GetElementIds()]
+walls = [w for w in walls if isinstance(w, Wall)]
+if not walls:
+    mode = forms.CommandSwitchWindow.show(["Pick Wall", "All Walls in View"],
+                                          message="Dimension which walls?")
+    if not mode:
         script.exit()
-except:
-    script.exit()
-
-# --- Step 2: Get wall direction and reference faces
-loc = wall.Location
-if not hasattr(loc, 'Curve'):
-    TaskDialog.Show("AutoDim", "Wall does not have a linear location curve.")
-    script.exit()
-
-curve = loc.Curve
-start = curve.GetEndPoint(0)
-end = curve.GetEndPoint(1)
-vec = (end - start).Normalize()
-
-is_vertical = abs(vec.X) < abs(vec.Y)
-ref_dir = XYZ.BasisY if is_vertical else XYZ.BasisX
-
-# --- Step 3: Gather face references from wall and inserts
-options = Options()
-options.ComputeReferences = True
-options.IncludeNonVisibleObjects = False
-options.DetailLevel = ViewDetailLevel.Fine
-
-ref_data = []
-
-# --- Collect face references from wall geometry
-def collect_wall_face_refs(w):
-    geo = w.get_Geometry(options)
-    for obj in geo:
-        solid = obj if isinstance(obj, Solid) else None
-        if not solid: continue
-        for face in solid.Faces:
-            try:
-                normal = face.ComputeNormal(UV(0.5, 0.5))
-                if normal.IsAlmostEqualTo(ref_dir) or normal.IsAlmostEqualTo(-ref_dir):
-                    ref = face.Reference
-                    origin = face.Origin
-                    offset = origin.X if is_vertical else origin.Y
-                    if ref is not None and ref.ElementId.IntegerValue > 0:
-                        ref_data.append((offset, ref))
-            except:
-                continue
-
-collect_wall_face_refs(wall)
-
-# --- Collect references from inserts (doors, windows, etc.)
-inserts = wall.FindInserts(True, False, False, False)
-for insert_id in inserts:
-    insert = doc.GetElement(insert_id)
-    if not insert:
-        continue
-    collect_wall_face_refs(insert)
-
-# --- Collect references from joined walls
-collector = FilteredElementCollector(doc, view.Id).OfClass(Wall).WhereElementIsNotElementType()
-for other_wall in collector:
-    if other_wall.Id == wall.Id:
-        continue
-    other_curve = other_wall.Location.Curve if hasattr(other_wall.Location, 'Curve') else None
-    if not other_curve:
-        continue
-    if curve.Distance(other_curve.GetEndPoint(0)) < 0.01 or curve.Distance(other_curve.GetEndPoint(1)) < 0.01:
-        collect_wall_face_refs(other_wall)
-
-# --- Step 4: Sort and prepare reference array
-if len(ref_data) < 2:
-    TaskDialog.Show("AutoDim", "Could not find enough referenceable faces.")
+    if mode == "All Walls in View":
+        walls = list(FilteredElementCollector(doc, view.Id).OfClass(Wall).WhereElementIsNotElementType())
+    else:
+        try:
+            ref = uidoc.Selection.PickObject(ObjectType.Element, "Select one wall")
+            wall = doc.GetElement(ref)
+            if not isinstance(wall, Wall):
+                TaskDialog.Show("AutoDim", "Selected element is not a wall.")
+                script.exit()
+            walls = [wall]
+        except:
+            script.exit()
+
+if not walls:
+    TaskDialog.Show("AutoDim", "No walls to dimension.")
     script.exit()
 
-ref_data.sort(key=lambda x: x[0])
-ref_array = ReferenceArray()
-for _, ref in ref_data:
-    ref_array.Append(ref)
-
-# --- Step 5: Build dimension line
-mid = curve.Evaluate(0.5, True)
-z = mid.Z
-min_offset = min(x[0] for x in ref_data) - 2
-max_offset = max(x[0] for x in ref_data) + 2
-
-if is_vertical:
-    pt1 = XYZ(mid.X, min_offset, z)
-    pt2 = XYZ(mid.X, max_offset, z)
-else:
-    pt1 = XYZ(min_offset, mid.Y, z)
-    pt2 = XYZ(max_offset, mid.Y, z)
-
-dim_line = Line.CreateBound(pt1, pt2)
-
-# --- Step 6: Get recent dimension type
-dim_type = None
-last_dims = FilteredElementCollector(doc).OfClass(Dimension).ToElements()
-if last_dims:
-    recent = sorted(last_dims, key=lambda d: d.Id.IntegerValue, reverse=True)[0]
-    dim_type = doc.GetElement(recent.GetTypeId())
-if not dim_type:
-    dim_types = FilteredElementCollector(doc).OfClass(DimensionType).ToElements()
-    linear_types = [dt for dt in dim_types if getattr(dt, "StyleType", None) == DimensionStyleType.Linear]
-    dim_type = linear_types[0] if linear_types else None
-if not dim_type:
-    TaskDialog.Show("AutoDim", "No dimension type found.")
-    script.exit()
-
-# --- Step 7: Create dimension
-with revit.Transaction("Create Wall Length Dimension"):
-    try:
-        plane = Plane.CreateByNormalAndOrigin(XYZ.BasisZ, pt1)
-        sketch_plane = SketchPlane.Create(doc, plane)
-        view.SketchPlane = sketch_plane
-        doc.Create.NewDimension(view, dim_line, ref_array, dim_type)
-        print("✅ Dimension created successfully.")
-    except Exception as e:
-        print("❌ ERROR DURING DIMENSION CREATION:")
-        print(traceback.format_exc())
-        TaskDialog.Show("AutoDim", "❌ Failed to create dimension:\n{}".format(str(e)))
-        script.exit()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+# Endpoint index of the view's walls, resolved once for every wall in the run
+wall_index = get_wall_index(doc, view)
 
 
+# --- Collect face references from the shared face cache
+def collect_wall_face_refs(w, ref_dir, is_vertical, ref_data):
+    for face in faces_along(doc, w, ref_dir):
+        offset = face.point.Y if is_vertical else face.point.X
+        ref_data.append((offset, face.reference))
 
 
+class WallSkipped(Exception):
+    pass
 
 
+def plan_wall_dimension(wall):
+    """Return (dim_line, ref_array) for one wall or raise WallSkipped."""
+    # --- Step 2: Get wall direction
+    curve = wall_curve(wall)
+    if curve is None:
+        raise WallSkipped("Wall does not have a linear location curve.")
 
+    start = curve.GetEndPoint(0)
+    end = curve.GetEndPoint(1)
+    vec = (end - start).Normalize()
 
+    is_vertical = abs(vec.X) < abs(vec.Y)
+    ref_dir = XYZ.BasisY if is_vertical else XYZ.BasisX
 
+    # --- Step 3: Gather face references from wall, inserts and joined walls
+    ref_data = []
+    collect_wall_face_refs(wall, ref_dir, is_vertical, ref_data)
 
+    for insert_id in wall.FindInserts(True, False, False, False):
+        insert = doc.GetElement(insert_id)
+        if not insert:
+            continue
+        collect_wall_face_refs(insert, ref_dir, is_vertical, ref_data)
 
+    for other_wall in find_joined_walls(doc, view, wall, index=wall_index):
+        collect_wall_face_refs(other_wall, ref_dir, is_vertical, ref_data)
 
+    if len(ref_data) < 2:
+        raise WallSkipped("Could not find enough referenceable faces.")
 
+    # --- Step 4: Sort and prepare reference array
+    ref_data.sort(key=lambda x: x[0])
+    ref_array = ReferenceArray()
+    for _, ref in ref_data:
+        ref_array.Append(ref)
 
+    # --- Step 5: Build dimension line
+    mid = curve.Evaluate(0.5, True)
+    z = mid.Z
+    min_offset = ref_data[0][0] - 2
+    max_offset = ref_data[-1][0] + 2
 
+    if is_vertical:
+        pt1 = XYZ(mid.X, min_offset, z)
+        pt2 = XYZ(mid.X, max_offset, z)
+    else:
+        pt1 = XYZ(min_offset, mid.Y, z)
+        pt2 = XYZ(max_offset, mid.Y, z)
 
+    return Line.CreateBound(pt1, pt2), ref_array
 
 
+# --- Step 6: Get dimension type (once per run)
+dim_type = get_dimension_type(doc)
+if not dim_type:
+    TaskDialog.Show("AutoDim", "No linear dimension types found.")
+    script.exit()
 
+# --- Step 7: Create all dimensions in one transaction group
+failures = []
+created = 0
 
+tg = TransactionGroup(doc, "Create Wall Length Dimensions")
+tg.Start()
+for wall in walls:
+    try:
+        dim_line, ref_array = plan_wall_dimension(wall)
+    except Exception as e:
+        failures.append((wall.Id, str(e)))
+        continue
 
+    t = Transaction(doc, "Create Wall Length Dimension")
+    t.Start()
+    try:
+        set_view_sketch_plane(doc, view, dim_line.GetEndPoint(0).Z)
+        doc.Create.NewDimension(view, dim_line, ref_array, dim_type)
+        t.Commit()
+        created += 1
+    except Exception as e:
+        t.RollBack()
+        failures.append((wall.Id, str(e)))
+        if len(walls) == 1:
+            print(traceback.format_exc())
+tg.Assimilate()
+if created:
+    remember_dimension_type(doc, dim_type)
+
+# --- Step 8: Report
+if len(walls) == 1:
+    if failures:
+        TaskDialog.Show("AutoDim", "❌ Failed to create dimension:\n{}".format(failures[0][1]))
+    else:
+        print("✅ Dimension created successfully.")
+else:
+    print("✅ {} of {} wall dimensions created.".format(created, len(walls)))
+    if failures:
+        print("❌ {} wall(s) failed:".format(len(failures)))
+        for wall_id, message in failures:
+            print("{} {}".format(output.linkify(wall_id), message))
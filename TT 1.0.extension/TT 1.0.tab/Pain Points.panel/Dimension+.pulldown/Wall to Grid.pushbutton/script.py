@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+__title__   = "Wall To Grid"
+__doc__     = """Version = 1.0
+Date    = 17.10.2026
+________________________________________________________________
+Description:
+Dimension each selected wall back to its nearest parallel
+structural grid: one string per wall from the grid through
+both wall faces, all in one transaction.
+________________________________________________________________
+Author: Zwe"""
+
+from pyrevit import revit, script
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI.Selection import ObjectType
+from Autodesk.Revit.UI import TaskDialog
+
+from Geometry._cluster import dedupe_references
+from Snippets._dimensions import (wall_direction, plan_normal, to_reference_array,
+                                  string_line, set_view_sketch_plane,
+                                  get_dimension_type, remember_dimension_type)
+from Snippets._facecache import faces_along
+from Snippets._grids import nearest_grid
+
+doc = revit.doc
+uidoc = revit.uidoc
+view = uidoc.ActiveView
+output = script.get_output()
+
+config = script.get_config()
+merge_tolerance = float(config.get_option("merge_tolerance_mm", 1.0)) / 304.8
+max_grid_distance = float(config.get_option("max_grid_distance_mm", 20000)) / 304.8
+
+# --- Step 1: Select walls
+walls = [doc.GetElement(eid) for eid in uidoc.Selection.GetElementIds()]
+walls = [w for w in walls if isinstance(w, Wall) and wall_direction(w)]
+if not walls:
+    try:
+        refs = uidoc.Selection.PickObjects(ObjectType.Element, "Select walls")
+    except:
+        script.exit()
+    walls = [doc.GetElement(r) for r in refs]
+    walls = [w for w in walls if isinstance(w, Wall) and wall_direction(w)]
+if not walls:
+    TaskDialog.Show("AutoDim", "No straight walls selected.")
+    script.exit()
+
+# --- Step 2: Plan one wall-to-grid string per wall
+plans = []
+failures = []
+for wall in walls:
+    d = wall_direction(wall)
+    n = plan_normal(d)
+    mid = wall.Location.Curve.Evaluate(0.5, True)
+
+    hit = nearest_grid(doc, mid, d, max_grid_distance)
+    if hit is None:
+        failures.append((wall.Id, "No parallel grid nearby."))
+        continue
+    grid, grid_ref = hit
+
+    grid_pt = grid.Curve.GetEndPoint(0)
+    ref_data = [(grid_pt.DotProduct(n), grid_ref, grid_pt)]
+    ref_data.extend((f.point.DotProduct(n), f.reference, f.point) for f in faces_along(doc, wall, n))
+    ref_data = dedupe_references(ref_data, merge_tolerance)
+    if len(ref_data) < 2:
+        failures.append((wall.Id, "Not enough references."))
+        continue
+    plans.append((wall, string_line(ref_data[0][0], ref_data[-1][0], n, mid), to_reference_array(ref_data)))
+
+if not plans:
+    TaskDialog.Show("AutoDim", "No wall could be tied to a grid.")
+    script.exit()
+
+# --- Step 3: Get dimension type
+dim_type = get_dimension_type(doc)
+if not dim_type:
+    TaskDialog.Show("AutoDim", "No linear dimension types found.")
+    script.exit()
+
+# --- Step 4: Create every string in one transaction
+created = 0
+with revit.Transaction("Dimension Walls to Grids"):
+    for wall, dim_line, ref_array in plans:
+        try:
+            set_view_sketch_plane(doc, view, dim_line.GetEndPoint(0).Z)
+            doc.Create.NewDimension(view, dim_line, ref_array, dim_type)
+            created += 1
+        except Exception as e:
+            failures.append((wall.Id, str(e)))
+
+if created:
+    remember_dimension_type(doc, dim_type)
+
+print("✅ {} wall-to-grid strings created.".format(created))
+if failures:
+    print("❌ {} wall(s) failed:".format(len(failures)))
+    for wall_id, message in failures:
+        print("{} {}".format(output.linkify(wall_id), message))
@@ -14,15 +14,18 @@ from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import TaskDialog
 import traceback
 
+from Geometry._cluster import group_by_direction
+from Snippets._dimensions import (wall_direction, plan_normal, collect_refs, to_reference_array,
+                                  string_line, set_view_sketch_plane,
+                                  get_dimension_type, remember_dimension_type)
+
 doc = revit.doc
 uidoc = revit.uidoc
 view = uidoc.ActiveView
 
-def get_wall_direction(wall):
-    loc = wall.Location
-    if hasattr(loc, 'Curve'):
-        return loc.Curve.Direction.Normalize()
-    return None
+# Faces closer than this along the string count as one plane (pyRevit config, mm)
+config = script.get_config()
+merge_tolerance = float(config.get_option("merge_tolerance_mm", 1.0)) / 304.8
 
 # --- Step 1: Require pre-selected walls
 selected_ids = uidoc.Selection.GetElementIds()
@@ -93,135 +96,59 @@ if len(filtered_walls) < 1:
     TaskDialog.Show("AutoDim", "No walls match the selected filters.")
     script.exit()
 
-# --- Step 5: Determine wall direction
-dirs = [get_wall_direction(w) for w in filtered_walls if get_wall_direction(w)]
-x_count = sum(1 for d in dirs if abs(d.X) > abs(d.Y))
-y_count = sum(1 for d in dirs if abs(d.Y) > abs(d.X))
-wall_direction = "X" if x_count >= y_count else "Y"
-face_normal_dir = XYZ.BasisY if wall_direction == "X" else XYZ.BasisX
-neg_face_normal_dir = XYZ(-face_normal_dir.X, -face_normal_dir.Y, -face_normal_dir.Z)
-
-# --- Step 6: Use most recent dimension type
-dim_type = None
-last_dims = FilteredElementCollector(doc).OfClass(Dimension).ToElements()
-if last_dims:
-    recent_dim = sorted(last_dims, key=lambda d: d.Id.IntegerValue, reverse=True)[0]
-    dim_type = doc.GetElement(recent_dim.GetTypeId())
-
-if not dim_type or not isinstance(dim_type, DimensionType):
-    dim_types = FilteredElementCollector(doc).OfClass(DimensionType).ToElements()
-    linear_types = [dt for dt in dim_types if getattr(dt, "StyleType", None) == DimensionStyleType.Linear]
-    if not linear_types:
-        TaskDialog.Show("AutoDim", "No linear dimension types found.")
-        script.exit()
-    dim_type = linear_types[0]
-
-# --- Step 7: Collect wall face references
-options = Options()
-options.ComputeReferences = True
-options.DetailLevel = ViewDetailLevel.Fine
-
-ref_data = []
-
-for wall in filtered_walls:
-    geo = wall.get_Geometry(options)
-    if not geo:
-        continue
-    for obj in geo:
-        solid = obj if isinstance(obj, Solid) else None
-        if not solid:
-            continue
-        for face in solid.Faces:
-            try:
-                norm = face.ComputeNormal(UV(0.5, 0.5)).Normalize()
-                if norm.IsAlmostEqualTo(face_normal_dir) or norm.IsAlmostEqualTo(neg_face_normal_dir):
-                    pt = face.Evaluate(UV(0.5, 0.5))
-                    coord = pt.X if wall_direction == "Y" else pt.Y
-                    ref_data.append((coord, face.Reference, pt))
-            except:
-                continue
-
-if len(ref_data) < 2:
-    TaskDialog.Show("AutoDim", "Not enough wall faces found for dimensioning.")
-    script.exit()
-
-# --- Step 8: Build sorted reference array
-ref_data.sort(key=lambda x: x[0])
-ref_array = ReferenceArray()
-for _, ref, _ in ref_data:
-    ref_array.Append(ref)
-
-mid_pt = ref_data[len(ref_data)//2][2]
-z = mid_pt.Z
-min_val = min([v[0] for v in ref_data]) - 2
-max_val = max([v[0] for v in ref_data]) + 2
-
-if wall_direction == "Y":
-    pt1 = XYZ(min_val, mid_pt.Y, z)
-    pt2 = XYZ(max_val, mid_pt.Y, z)
-else:
-    pt1 = XYZ(mid_pt.X, min_val, z)
-    pt2 = XYZ(mid_pt.X, max_val, z)
-
-dim_line = Line.CreateBound(pt1, pt2)
-
-# --- Step 9: Create the dimension
-with revit.Transaction("Create Wall Dimension"):
-    try:
-        plane = Plane.CreateByNormalAndOrigin(XYZ.BasisZ, pt1)
-        sketch_plane = SketchPlane.Create(doc, plane)
-        view.SketchPlane = sketch_plane
-        doc.Create.NewDimension(view, dim_line, ref_array, dim_type)
-        
-    except Exception as e:
-        print("❌ ERROR during dimension:")
-        print(traceback.format_exc())
-        TaskDialog.Show("AutoDim", "❌ Failed to create dimension:\n{}".format(str(e)))
-        script.exit()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+# --- Step 5: Group walls into parallel families (any orientation)
+def direction_tuple(wall):
+    d = wall_direction(wall)
+    return (d.X, d.Y) if d else None
 
+families = group_by_direction(filtered_walls, direction_tuple)
 
+# --- Step 6: Get dimension type
+dim_type = get_dimension_type(doc)
+if not dim_type:
+    TaskDialog.Show("AutoDim", "No linear dimension types found.")
+    script.exit()
 
+# --- Step 7: Build one reference string per family
+def plan_family_dimension(walls):
+    """Return (dim_line, ref_array) for one parallel family, or None."""
+    # Projection axis: perpendicular to the family's walls, in plan
+    axis = plan_normal(wall_direction(walls[0]))
+    sources = [(wall, plan_normal(wall_direction(wall))) for wall in walls]
 
+    # Coplanar faces of joined or stacked walls collapse to one reference per plane
+    ref_data = collect_refs(doc, sources, axis, merge_tolerance)
+    if len(ref_data) < 2:
+        return None
 
+    mid_pt = ref_data[len(ref_data)//2][2]
+    dim_line = string_line(ref_data[0][0], ref_data[-1][0], axis, mid_pt)
+    return dim_line, to_reference_array(ref_data)
 
 
+plans = []
+for angle, walls in families:
+    plan = plan_family_dimension(walls)
+    if plan:
+        plans.append((angle, plan))
 
+if not plans:
+    TaskDialog.Show("AutoDim", "Not enough wall faces found for dimensioning.")
+    script.exit()
 
+# --- Step 8: Create one dimension per family in a single transaction
+failures = []
+with revit.Transaction("Create Wall Dimension"):
+    for angle, (dim_line, ref_array) in plans:
+        try:
+            set_view_sketch_plane(doc, view, dim_line.GetEndPoint(0).Z)
+            doc.Create.NewDimension(view, dim_line, ref_array, dim_type)
+        except Exception as e:
+            print("❌ ERROR during dimension at {:.1f}°:".format(angle))
+            print(traceback.format_exc())
+            failures.append("{:.1f}°: {}".format(angle, str(e)))
+
+if len(failures) < len(plans):
+    remember_dimension_type(doc, dim_type)
+if failures:
+    TaskDialog.Show("AutoDim", "❌ Failed to create dimension:\n{}".format("\n".join(failures)))
@@ -9,60 +9,125 @@ Description:
 ________________________________________________________________
 Author: Zwe"""
 
-from pyrevit import revit, DB, forms
-from Autodesk.Revit.UI.Selection import ObjectType, ISelectionFilter
+from pyrevit import revit, DB, forms, script
+
+from Geometry._boundary import boundary_hash
+from Snippets._rooms import (select_rooms, get_room_geometry_service, segments_to_curve_loop,
+                             tag_source, tagged_elements_by_room)
+from Snippets._transactions import run_batched
 
 doc = revit.doc
 uidoc = revit.uidoc
+output = script.get_output()
+
+CHUNK_SIZE = 100            # rooms per committed transaction
+FROM_FINISH = "<Room Floor Finish>"
+SYNC = "Sync Floors"
 
 # ------------------------------
-# Room Selection Filter
+# Select Rooms (pre-selection, picked rooms, every room on a level) or Sync
 # ------------------------------
-class RoomSelectionFilter(ISelectionFilter):
-    def AllowElement(self, element):
-        return isinstance(element, DB.Architecture.Room)
-    def AllowReference(self, ref, point):
-        return True
+rooms, mode = select_rooms(doc, uidoc, "Create floors for:", [SYNC])
+if not rooms and mode != SYNC:
+    forms.alert("No placed rooms selected.")
+    script.exit()
 
 # ------------------------------
-# Select Room
+# Room Boundaries: one loop per boundary (outer + holes), collinear pieces merged,
+# cached per room by the shared room geometry service
 # ------------------------------
-room_ref = uidoc.Selection.PickObject(ObjectType.Element, RoomSelectionFilter(), "Select a room")
-room = doc.GetElement(room_ref.ElementId)
+geometry = get_room_geometry_service(doc)
 
-if not room or not room.Location:
-    forms.alert("Selected room is not valid or not placed.")
-    raise Exception("Invalid room")
 
-# ------------------------------
-# Get Room Boundaries
-# ------------------------------
-options = DB.SpatialElementBoundaryOptions()
-boundaries = room.GetBoundarySegments(options)
+def floor_hash(room, loops, floor_type_id, offset):
+    """Boundary + level + offset + type fingerprint stored on each floor."""
+    return boundary_hash(loops, (room.LevelId.IntegerValue, round(offset, 6), floor_type_id.IntegerValue))
+
+
+def floor_offset(floor):
+    offset_param = floor.get_Parameter(DB.BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
+    return offset_param.AsDouble() if offset_param else 0.0
 
-if not boundaries:
-    forms.alert("Room has no boundary segments.")
-    raise Exception("No boundaries")
 
-curves = []
-for loop in boundaries:
-    for seg in loop:
-        curves.append(seg.GetCurve())
+untagged = []
+
+
+def create_room_floor(room, floor_type_id, offset, loops=None):
+    if loops is None:
+        loops = geometry.get(room).loops
+    if not loops:
+        raise Exception("Room has no boundary segments.")
+    curve_loops = [segments_to_curve_loop(lp) for lp in loops]
+    floor = DB.Floor.Create(doc, curve_loops, floor_type_id, room.LevelId)
+    offset_param = floor.get_Parameter(DB.BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
+    if offset_param and offset != 0:
+        offset_param.Set(offset)
+    if not tag_source(floor, room, floor_hash(room, loops, floor_type_id, offset)):
+        untagged.append(floor.Id)
+    return floor
+
+
+def report(failures, label):
+    """failures: (element id, name, message) triples."""
+    if failures:
+        output.print_md("### ❌ {} {} skipped".format(len(failures), label))
+        for element_id, name, message in failures:
+            print("{} {} - {}".format(output.linkify(element_id), name, message))
+
+
+def report_untagged():
+    if untagged:
+        output.print_md("⚠️ {} floor(s) could not record their source room. Add the "
+                        "*TTSourceRoomId* and *TTBoundaryHash* shared parameters (TT 1.0.txt) "
+                        "to Floors to enable **{}**.".format(len(untagged), SYNC))
+
 
 # ------------------------------
-# Ask for Offset (IronPython safe)
+# Sync: recreate floors only where boundary, level, offset or type changed
 # ------------------------------
-offset_input = forms.ask_for_string(default="0", prompt="Offset from level (in mm):")
-try:
-    offset_mm = float(offset_input)
-except:
-    forms.alert("Invalid number. Using 0 mm offset.")
-    offset_mm = 0.0
-
-offset = offset_mm / 304.8  # mm to feet
+if mode == SYNC:
+    floors = DB.FilteredElementCollector(doc).OfClass(DB.Floor).WhereElementIsNotElementType()
+    by_room = tagged_elements_by_room(floors)
+    if not by_room:
+        forms.alert("No floors created by Floor to Room were found.")
+        script.exit()
+
+    to_delete = []
+    to_recreate = []
+    unchanged = 0
+    for room_id, tagged in by_room.items():
+        room = doc.GetElement(DB.ElementId(room_id))
+        if not isinstance(room, DB.Architecture.Room) or not room.Location or room.Area <= 0:
+            to_delete.extend(floor.Id for floor, _ in tagged)
+            continue
+        loops = geometry.get(room).loops
+        for floor, old_hash in tagged:
+            offset = floor_offset(floor)  # keep each floor's own offset
+            if floor_hash(room, loops, floor.GetTypeId(), offset) == old_hash:
+                unchanged += 1
+            else:
+                to_recreate.append((room, floor.Id, floor.GetTypeId(), offset, loops))
+
+    def resync(job):
+        room, floor_id, floor_type_id, offset, loops = job
+        doc.Delete(floor_id)
+        return create_room_floor(room, floor_type_id, offset, loops)
+
+    def remove(floor_id):
+        doc.Delete(floor_id)
+
+    recreated, failures = run_batched(doc, "Sync Floors to Rooms", to_recreate, resync, CHUNK_SIZE)
+    deleted, delete_failures = run_batched(doc, "Delete Orphan Room Floors", to_delete, remove, CHUNK_SIZE)
+
+    report([(job[0].Id, job[0].Number, message) for job, message in failures], "room(s)")
+    report([(floor_id, "", message) for floor_id, message in delete_failures], "orphan floor(s)")
+    report_untagged()
+    forms.alert("{} floors updated, {} deleted, {} unchanged.".format(
+        len(recreated), len(deleted), unchanged), title="Done")
+    script.exit()
 
 # ------------------------------
-# Select Floor Type (Safe for IronPython)
+# Select Floor Type once, or map it from each room's floor finish
 # ------------------------------
 floor_types = DB.FilteredElementCollector(doc).OfClass(DB.FloorType).ToElements()
 floor_type_map = {
@@ -70,46 +135,49 @@ floor_type_map = {
     for ft in floor_types
 }
 floor_type_name = forms.SelectFromList.show(
-    sorted(floor_type_map.keys()),
+    [FROM_FINISH] + sorted(floor_type_map.keys()),
     button_name="Select Floor Type"
 )
-floor_type = floor_type_map.get(floor_type_name)
-
-if not floor_type:
+if not floor_type_name:
     forms.alert("No floor type selected.")
-    raise Exception("No floor type")
+    script.exit()
 
 # ------------------------------
-# Select Level (Safe for IronPython)
-# ------------------------------
-levels = DB.FilteredElementCollector(doc).OfClass(DB.Level).ToElements()
-level_map = { lvl.Name: lvl for lvl in levels }
-
-level_name = forms.SelectFromList.show(
-    sorted(level_map.keys()),
-    button_name="Select Level"
-)
-level = level_map.get(level_name)
-
-if not level:
-    raise Exception("No level selected")
-
-# ------------------------------
-# Create Floor using DB.Floor.Create()
+# Ask for Offset (IronPython safe)
 # ------------------------------
-curve_loops = DB.CurveLoop.Create(curves)
-
-with revit.Transaction("Create Floor from Room Boundary"):
-    floor = DB.Floor.Create(doc, [curve_loops], floor_type.Id, level.Id)
-    offset_param = floor.get_Parameter(DB.BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
-    if offset_param and offset != 0:
-        offset_param.Set(offset)
-
-forms.alert("Floor created successfully!", title="Done")
+offset_input = forms.ask_for_string(default="0", prompt="Offset from level (in mm):")
+if offset_input is None:
+    script.exit()
+try:
+    offset_mm = float(offset_input)
+except:
+    forms.alert("Invalid number. Using 0 mm offset.")
+    offset_mm = 0.0
 
+offset = offset_mm / 304.8  # mm to feet
 
 
+def floor_type_for(room):
+    if floor_type_name != FROM_FINISH:
+        return floor_type_map.get(floor_type_name)
+    finish = room.get_Parameter(DB.BuiltInParameter.ROOM_FINISH_FLOOR)
+    return floor_type_map.get(finish.AsString() if finish else None)
 
 
+def create_floor_for(room):
+    floor_type = floor_type_for(room)
+    if not floor_type:
+        raise Exception("No matching floor type.")
+    return create_room_floor(room, floor_type.Id, offset)
 
+# ------------------------------
+# Create Floors: one group, chunked commits, one sub-transaction per room
+# ------------------------------
+created, failures = run_batched(doc, "Create Floors from Room Boundaries", rooms, create_floor_for, CHUNK_SIZE)
 
+# ------------------------------
+# Summary
+# ------------------------------
+report([(room.Id, room.Number, message) for room, message in failures], "room(s)")
+report_untagged()
+forms.alert("{} of {} floors created successfully!".format(len(created), len(rooms)), title="Done")
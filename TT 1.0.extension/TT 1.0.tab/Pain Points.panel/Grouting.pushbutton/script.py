@@ -15,42 +15,48 @@ from Autodesk.Revit.DB import InstanceVoidCutUtils
 from Autodesk.Revit.DB.Structure import StructuralType
 from Autodesk.Revit.UI.Selection import ObjectType
 
-# --- Selection ---
+from Geometry._framing import GroutRect, grout_rect, local_extents, merge_rects, to_world
+from Snippets._grout import (GROUT_HOST_PARAM, GROUT_INSERTS_PARAM, grout_key, grout_voids_by_key,
+                             read_grout, tag_grout)
+from Snippets._transactions import run_batched
+from Snippets._walls import insert_box_corners, inserts_by_host, wall_frame_at
+
 doc = revit.doc
 uidoc = revit.uidoc
+output = script.get_output()
 
-# Select inserts (windows/doors)
-insert_refs = uidoc.Selection.PickObjects(ObjectType.Element, "Select windows/doors")
-inserts = [doc.GetElement(r) for r in insert_refs if isinstance(doc.GetElement(r), FamilyInstance)]
+TOLERANCE = 1.0 / 304.8  # 1 mm, below which an existing void is left as is
 
-if not inserts:
-    forms.alert("No valid family instances selected.")
-    script.exit()
+SELECTED = "Selected Doors/Windows"
+WHOLE_MODEL = "Whole Model"
 
-# Select wall
-wall_ref = uidoc.Selection.PickObject(ObjectType.Element, "Select the host wall")
-wall = doc.GetElement(wall_ref)
-if not isinstance(wall, Wall):
-    forms.alert("You must select a wall.")
+# --- Selection: picked inserts, or every door/window in the model grouped by host ---
+mode = forms.CommandSwitchWindow.show([SELECTED, WHOLE_MODEL], message="Add grout voids to:")
+if not mode:
     script.exit()
 
-# Validate all inserts are hosted on selected wall
-for inst in inserts:
-    if inst.Host.Id != wall.Id:
-        forms.alert("All selected inserts must be hosted on the selected wall.")
+if mode == SELECTED:
+    try:
+        insert_refs = uidoc.Selection.PickObjects(ObjectType.Element, "Select windows/doors")
+    except:
         script.exit()
+    inserts = [doc.GetElement(r) for r in insert_refs if isinstance(doc.GetElement(r), FamilyInstance)]
+    inserts_by_wall = {}
+    for inst in inserts:
+        if isinstance(inst.Host, Wall):
+            inserts_by_wall.setdefault(inst.Host.Id.IntegerValue, []).append(inst)
+else:
+    inserts_by_wall = inserts_by_host(doc)
+    inserts_by_wall = {h: i for h, i in inserts_by_wall.items()
+                       if isinstance(doc.GetElement(ElementId(h)), Wall)}
+
+if not inserts_by_wall:
+    forms.alert("No wall-hosted windows/doors found.")
+    script.exit()
 
 # --- User Input ---
-selected_sides = []
-if forms.alert('Add grout on LEFT?', options=['Yes', 'No']) == 'Yes':
-    selected_sides.append("left")
-if forms.alert('Add grout on RIGHT?', options=['Yes', 'No']) == 'Yes':
-    selected_sides.append("right")
-if forms.alert('Add grout on TOP?', options=['Yes', 'No']) == 'Yes':
-    selected_sides.append("top")
-if forms.alert('Add grout on BOTTOM?', options=['Yes', 'No']) == 'Yes':
-    selected_sides.append("bottom")
-
+selected_sides = forms.SelectFromList.show(["left", "right", "top", "bottom"], multiselect=True,
+                                           title="Add grout on sides", button_name="Use Sides")
 if not selected_sides:
     script.exit()
 
@@ -74,78 +80,153 @@ if not symbol:
     forms.alert("Void family 'Void_Grout' not loaded.")
     script.exit()
 
-# --- Place voids and cut wall ---
-with revit.Transaction("Place Grout Voids"):
-    if not symbol.IsActive:
-        symbol.Activate()
-        doc.Regenerate()
-
-    for insert in inserts:
-        bbox = insert.get_BoundingBox(doc.ActiveView)
-        min_pt, max_pt = bbox.Min, bbox.Max
-        center = (min_pt + max_pt) * 0.5
-        width = max_pt.X - min_pt.X
-        height = max_pt.Z - min_pt.Z
-
-        # Expand width/height based on selected sides
-        extra_width = grout_thickness if "left" in selected_sides else 0
-        extra_width += grout_thickness if "right" in selected_sides else 0
-
-        extra_height = grout_thickness if "top" in selected_sides else 0
-        extra_height += grout_thickness if "bottom" in selected_sides else 0
-
-        # Assume wall thickness is width of bounding box in Y (for simplicity)
-        wall_thickness = max_pt.Y - min_pt.Y
-
-        void_inst = doc.Create.NewFamilyInstance(center, symbol, wall, StructuralType.NonStructural)
-
-        # Set parameters
-        try:
-            void_inst.LookupParameter("VoidWidth").Set(width + extra_width)
-            void_inst.LookupParameter("VoidHeight").Set(height + extra_height)
-            void_inst.LookupParameter("VoidDepth").Set(wall_thickness)
-        except:
-            forms.alert("Void instance missing expected parameters.")
+# Voids placed by earlier runs, keyed by host and the openings they surround
+existing, duplicates = grout_voids_by_key(doc, symbol.Family)
+
+# --- Picked openings bring in the rest of any earlier merged group, so the
+# group's void is rebuilt rather than replaced by a smaller one ---
+if mode == SELECTED:
+    picked = set(i.Id.IntegerValue for insts in inserts_by_wall.values() for i in insts)
+    grown = True
+    while grown:
+        grown = False
+        for host_id, insert_ids, _ in existing:
+            if picked.isdisjoint(insert_ids) or picked.issuperset(insert_ids):
+                continue
+            for insert_id in insert_ids:
+                insert = doc.GetElement(ElementId(insert_id))
+                if insert_id in picked or insert is None or insert.Host is None \
+                        or insert.Host.Id.IntegerValue != host_id:
+                    continue
+                picked.add(insert_id)
+                inserts_by_wall.setdefault(host_id, []).append(insert)
+                grown = True
+
+# --- Size every opening in its host wall's frame, before any Revit writes ---
+openings, skipped = [], []
+for host_id in sorted(inserts_by_wall):
+    wall = doc.GetElement(ElementId(host_id))
+    for insert in inserts_by_wall[host_id]:
+        corners = insert_box_corners(insert)
+        point = insert.Location.Point if hasattr(insert.Location, "Point") else None
+        frame = wall_frame_at(wall, point) if corners else None
+        if frame is None:
+            skipped.append(insert.Id)
             continue
+        openings.append((host_id, insert.Id.IntegerValue, frame, corners))
+
+extents = local_extents([o[2] for o in openings], [o[3] for o in openings])
+
+# Grout rectangles per host and frame; openings that overlap or touch are
+# unioned and cut into as few non-overlapping voids as their outline allows
+rects_by_frame = {}
+for (host_id, insert_id, frame, _), extent in zip(openings, extents):
+    u0, u1, w0, w1 = grout_rect(extent, selected_sides, grout_thickness)
+    rects_by_frame.setdefault((host_id, frame), []).append(
+        GroutRect(u0, u1, w0, w1, extent[2], extent[3], (insert_id,), 0))
+
+voids_by_wall = {}
+for (host_id, frame), rects in sorted(rects_by_frame.items()):
+    wall_width = doc.GetElement(ElementId(host_id)).Width
+    for r in merge_rects(rects):
+        # Centred on the opening through the wall; twice the wall width reaches
+        # both faces wherever the location line sits, and a void only cuts its host.
+        center = XYZ(*to_world(frame, (r.u0 + r.u1) * 0.5, (r.v0 + r.v1) * 0.5, (r.w0 + r.w1) * 0.5))
+        voids_by_wall.setdefault(host_id, []).append(
+            (grout_key(host_id, r.keys, r.part), center, r.u1 - r.u0, r.w1 - r.w0, 2 * wall_width))
+
+if not voids_by_wall:
+    forms.alert("No opening geometry found for the selected windows/doors.")
+    script.exit()
+
+# --- Match voids placed by earlier runs: update, keep or delete ---
+planned_keys = set(spec[0] for specs in voids_by_wall.values() for spec in specs)
+planned_inserts = set(i for host_id, insert_ids, _ in planned_keys for i in insert_ids)
+
+
+def opening_gone(host_id, insert_id):
+    insert = doc.GetElement(ElementId(insert_id))
+    return insert is None or insert.Host is None or insert.Host.Id.IntegerValue != host_id
+
+
+stale_by_wall = {}
+for void in duplicates:
+    stale_by_wall.setdefault(read_grout(void)[0], []).append(void.Id)
+for key, void in existing.items():
+    host_id, insert_ids, _ = key
+    if key in planned_keys:
+        continue
+    # Superseded by a new grouping of its openings, or an opening was removed
+    if any(i in planned_inserts or opening_gone(host_id, i) for i in insert_ids):
+        stale_by_wall.setdefault(host_id, []).append(void.Id)
+
+
+def set_void_size(void_inst, width, height, depth):
+    params = [void_inst.LookupParameter(n) for n in ("VoidWidth", "VoidHeight", "VoidDepth")]
+    if not all(params):
+        raise Exception("Void instance missing expected parameters.")
+    changed = False
+    for param, value in zip(params, (width, height, depth)):
+        if abs(param.AsDouble() - value) > TOLERANCE:
+            param.Set(value)
+            changed = True
+    return changed
+
+
+# --- Place, update and delete voids and cut wall, one sub-transaction per host ---
+def grout_host(host_id):
+    wall = doc.GetElement(ElementId(host_id))
+    can_cut = InstanceVoidCutUtils.CanBeCutWithVoid(wall)
+    counts = {"created": 0, "updated": 0, "deleted": 0, "untagged": 0}
+    for void_id in stale_by_wall.get(host_id, []):
+        doc.Delete(void_id)
+        counts["deleted"] += 1
+    for key, center, width, height, depth in voids_by_wall.get(host_id, []):
+        void_inst = existing.get(key)
+        if void_inst is None:
+            void_inst = doc.Create.NewFamilyInstance(center, symbol, wall, StructuralType.NonStructural)
+            set_void_size(void_inst, width, height, depth)
+            if not tag_grout(void_inst, host_id, key[1], key[2]):
+                counts["untagged"] += 1
+            counts["created"] += 1
+        else:
+            changed = set_void_size(void_inst, width, height, depth)
+            move = center - void_inst.Location.Point
+            if move.GetLength() > TOLERANCE:
+                ElementTransformUtils.MoveElement(doc, void_inst.Id, move)
+                changed = True
+            if changed:
+                counts["updated"] += 1
 
         # Cut wall
-        if InstanceVoidCutUtils.CanBeCutWithVoid(wall):
+        if can_cut and not InstanceVoidCutUtils.InstanceVoidCutExists(wall, void_inst):
             InstanceVoidCutUtils.AddInstanceVoidCut(doc, wall, void_inst)
-
-forms.alert("✅ Voids placed and wall cut successfully.")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    return counts
 
 
+if not symbol.IsActive:
+    with revit.Transaction("Activate Grout Void"):
+        symbol.Activate()
 
+host_ids = sorted(set(voids_by_wall) | set(stale_by_wall))
+done, failures = run_batched(doc, "Place Grout Voids", host_ids, grout_host, chunk_size=len(host_ids))
+
+# --- Report ---
+totals = dict((k, sum(c[k] for c in done)) for k in ("created", "updated", "deleted", "untagged"))
+if failures:
+    output.print_md("### ❌ {} wall(s) failed".format(len(failures)))
+    for host_id, message in failures:
+        print("{} {}".format(output.linkify(ElementId(host_id)), message))
+if skipped:
+    output.print_md("### ⚠️ {} opening(s) skipped, no geometry".format(len(skipped)))
+    for insert_id in skipped:
+        print(output.linkify(insert_id))
+if totals["untagged"]:
+    output.print_md("### ⚠️ {} void(s) could not be tagged".format(totals["untagged"]))
+    print("Load the '{}' and '{}' shared parameters for the void category "
+          "so a re-run can update them instead of adding new ones.".format(GROUT_HOST_PARAM, GROUT_INSERTS_PARAM))
+
+forms.alert("✅ Grout voids for {} opening(s): {} created, {} updated, {} deleted. "
+            "{} of {} walls processed successfully.".format(
+                len(openings), totals["created"], totals["updated"], totals["deleted"],
+                len(done), len(host_ids)))
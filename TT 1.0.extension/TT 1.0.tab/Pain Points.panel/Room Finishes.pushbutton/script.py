@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+__title__   = "Room Finishes"
+__doc__     = """Version = 1.0
+Date    = 17.10.2026
+________________________________________________________________
+Description:
+Create floors, ceilings and skirtings for many rooms in one run.
+Boundaries are read once per room (shared with Floor to Room);
+skirtings follow the bounding walls and stop at door openings.
+________________________________________________________________
+Author: Zwe"""
+
+from pyrevit import revit, DB, forms, script
+
+from Geometry._boundary import boundary_hash
+from Geometry._framing import local_extents, wall_frame
+from Geometry._intervals import subtract_intervals
+from Snippets._rooms import (select_rooms, get_room_geometry_service, segments_to_curve_loop,
+                             tag_source)
+from Snippets._transactions import run_batched
+from Snippets._walls import insert_box_corners, inserts_by_host, xyz_tuple
+
+doc = revit.doc
+uidoc = revit.uidoc
+output = script.get_output()
+
+MM_TO_FEET = 1 / 304.8
+CHUNK_SIZE = 50             # rooms per committed transaction
+MIN_SKIRTING = 50 * MM_TO_FEET
+FLOOR, CEILING, SKIRTING = "Floor", "Ceiling", "Skirting"
+
+# ------------------------------
+# Select Rooms and Finishes
+# ------------------------------
+rooms, mode = select_rooms(doc, uidoc, "Create finishes for:")
+if not rooms:
+    forms.alert("No placed rooms selected.")
+    script.exit()
+
+finishes = forms.SelectFromList.show([FLOOR, CEILING, SKIRTING], multiselect=True,
+                                     title="Finishes to create", button_name="Create")
+if not finishes:
+    script.exit()
+
+
+def pick_type(elements, title, finish_label=None):
+    """Pick one type by name; finish_label adds a 'from room finish' entry."""
+    type_map = {t.get_Parameter(DB.BuiltInParameter.SYMBOL_NAME_PARAM).AsString(): t for t in elements}
+    names = sorted(type_map.keys())
+    if finish_label:
+        names = [finish_label] + names
+    name = forms.SelectFromList.show(names, title=title, button_name="Use This Type")
+    if not name:
+        script.exit()
+    return type_map, name
+
+
+def ask_mm(prompt, default):
+    value = forms.ask_for_string(default=default, prompt=prompt)
+    if value is None:
+        script.exit()
+    try:
+        return float(value) * MM_TO_FEET
+    except:
+        forms.alert("Invalid number.", exitscript=True)
+
+
+def type_for(room, type_map, name, finish_param):
+    if not name.startswith("<"):
+        return type_map.get(name)
+    finish = room.get_Parameter(finish_param)
+    return type_map.get(finish.AsString() if finish else None)
+
+
+if FLOOR in finishes:
+    floor_types, floor_choice = pick_type(DB.FilteredElementCollector(doc).OfClass(DB.FloorType),
+                                          "Floor Type", "<Room Floor Finish>")
+    floor_offset = ask_mm("Floor offset from level (in mm):", "0")
+if CEILING in finishes:
+    ceiling_types, ceiling_choice = pick_type(DB.FilteredElementCollector(doc).OfClass(DB.CeilingType),
+                                              "Ceiling Type", "<Room Ceiling Finish>")
+    ceiling_height = ask_mm("Ceiling height above level (in mm):", "2700")
+if SKIRTING in finishes:
+    skirting_types, skirting_choice = pick_type(
+        [wt for wt in DB.FilteredElementCollector(doc).OfClass(DB.WallType) if wt.Kind == DB.WallKind.Basic],
+        "Skirting Wall Type")
+    skirting_height = ask_mm("Skirting height (in mm):", "100")
+
+# ------------------------------
+# Boundaries (shared room geometry service) and doors for skirting gaps
+# ------------------------------
+geometry = get_room_geometry_service(doc)
+room_geometry, geometry_errors = geometry.get_all(rooms)
+
+doors_by_host = {}
+if SKIRTING in finishes:
+    wall_ids = set(eid for g in room_geometry.values() for _, eid in g.segments if eid > 0)
+    for host_id, inserts in inserts_by_host(doc, wall_ids).items():
+        doors = [i for i in inserts if i.Category.Id.IntegerValue == int(DB.BuiltInCategory.OST_Doors)]
+        # Oriented box corners, so doors in skewed walls are not widened by an axis-aligned box
+        corners = [c for c in (insert_box_corners(door) for door in doors) if c]
+        if corners:
+            doors_by_host[host_id] = corners
+
+
+def door_gaps(curve, door_corners):
+    """(lo, hi) length spans of the doors along a boundary segment.
+
+    Straight segments measure the corners in the segment's frame; curved
+    ones project each corner onto the curve, at the curve's height."""
+    if not door_corners:
+        return []
+    if not isinstance(curve, DB.Line):
+        z = curve.GetEndPoint(0).Z
+        gaps = []
+        for corners in door_corners:
+            at = [curve.ComputeNormalizedParameter(curve.Project(DB.XYZ(x, y, z)).Parameter) * curve.Length
+                  for x, y, _ in corners]
+            gaps.append((min(at), max(at)))
+        return gaps
+    frame = wall_frame(xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1)))
+    return [(u0, u1) for u0, u1, _, _, _, _ in local_extents([frame] * len(door_corners), door_corners)]
+
+
+def skirting_curves(g):
+    """Skirting centre lines along the bounding walls, offset into the room."""
+    half = skirting_types[skirting_choice].Width / 2
+    curves = []
+    for curve, host_id in g.segments:
+        if host_id <= 0 or not isinstance(doc.GetElement(DB.ElementId(host_id)), DB.Wall):
+            continue
+        if isinstance(curve, DB.Line):
+            d = curve.Direction
+            inward = DB.XYZ(-d.Y, d.X, 0) * half  # room lies left of its boundary
+            start = curve.GetEndPoint(0) + inward
+            for lo, hi in subtract_intervals((0.0, curve.Length), door_gaps(curve, doors_by_host.get(host_id, [])),
+                                             MIN_SKIRTING):
+                curves.append(DB.Line.CreateBound(start + d * lo, start + d * hi))
+        else:
+            try:
+                offset = curve.CreateOffset(-half, DB.XYZ.BasisZ)
+            except:
+                continue
+            # A concentric offset keeps the normalized parameter of every point
+            length = curve.Length
+            for lo, hi in subtract_intervals((0.0, length), door_gaps(curve, doors_by_host.get(host_id, [])),
+                                             MIN_SKIRTING):
+                piece = offset.Clone()
+                piece.MakeBound(offset.ComputeRawParameter(lo / length), offset.ComputeRawParameter(hi / length))
+                curves.append(piece)
+    return curves
+
+# ------------------------------
+# Create Finishes: one group, chunked commits, one sub-transaction per room
+# ------------------------------
+def create_finishes(room):
+    """Create the chosen finishes of one room; returns {finish: count}."""
+    g = room_geometry.get(room.Id.IntegerValue)
+    if g is None:
+        raise Exception(geometry_errors.get(room.Id.IntegerValue, "Room boundary could not be read."))
+    if not g.loops:
+        raise Exception("Room has no boundary segments.")
+    curve_loops = [segments_to_curve_loop(lp) for lp in g.loops]
+    level = room.LevelId.IntegerValue
+    counts = {FLOOR: 0, CEILING: 0, SKIRTING: 0}
+
+    if FLOOR in finishes:
+        floor_type = type_for(room, floor_types, floor_choice, DB.BuiltInParameter.ROOM_FINISH_FLOOR)
+        if not floor_type:
+            raise Exception("No matching floor type.")
+        floor = DB.Floor.Create(doc, curve_loops, floor_type.Id, room.LevelId)
+        if floor_offset:
+            floor.get_Parameter(DB.BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM).Set(floor_offset)
+        tag_source(floor, room, boundary_hash(g.loops, (level, round(floor_offset, 6), floor_type.Id.IntegerValue)))
+        counts[FLOOR] += 1
+
+    if CEILING in finishes:
+        ceiling_type = type_for(room, ceiling_types, ceiling_choice, DB.BuiltInParameter.ROOM_FINISH_CEILING)
+        if not ceiling_type:
+            raise Exception("No matching ceiling type.")
+        ceiling = DB.Ceiling.Create(doc, curve_loops, ceiling_type.Id, room.LevelId)
+        ceiling.get_Parameter(DB.BuiltInParameter.CEILING_HEIGHTABOVELEVEL_PARAM).Set(ceiling_height)
+        tag_source(ceiling, room, boundary_hash(g.loops, (level, round(ceiling_height, 6), ceiling_type.Id.IntegerValue)))
+        counts[CEILING] += 1
+
+    if SKIRTING in finishes:
+        wall_type = skirting_types[skirting_choice]
+        skirting_hash = boundary_hash(g.loops, (level, round(skirting_height, 6), wall_type.Id.IntegerValue))
+        for curve in skirting_curves(g):
+            skirting = DB.Wall.Create(doc, curve, wall_type.Id, room.LevelId, skirting_height, 0.0, False, False)
+            skirting.get_Parameter(DB.BuiltInParameter.WALL_ATTR_ROOM_BOUNDING).Set(0)
+            tag_source(skirting, room, skirting_hash)
+            counts[SKIRTING] += 1
+    return counts
+
+
+done, failures = run_batched(doc, "Create Room Finishes", rooms, create_finishes, CHUNK_SIZE)
+
+# ------------------------------
+# Summary
+# ------------------------------
+if failures:
+    output.print_md("### ❌ {} room(s) skipped".format(len(failures)))
+    for room, message in failures:
+        print("{} {} - {}".format(output.linkify(room.Id), room.Number, message))
+
+totals = dict((finish, sum(c[finish] for c in done)) for finish in (FLOOR, CEILING, SKIRTING))
+forms.alert("{} rooms finished: {} floors, {} ceilings, {} skirting walls.".format(
+    len(done), totals[FLOOR], totals[CEILING], totals[SKIRTING]), title="Done")
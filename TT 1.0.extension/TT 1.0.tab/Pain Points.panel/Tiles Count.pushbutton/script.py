@@ -4,19 +4,311 @@ __doc__     = """Version = 1.0
 Date    = 15.06.2024
 ________________________________________________________________
 Description:
-
-
+Counts full and cut tiles on the top face of the selected floors
+for a given tile size, joint, rotation and setting-out offset from
+the corner of each face.
+Offcuts are reused for other cut pieces before the boxes to order
+are worked out.
+Optimise Setting-Out searches origin offsets and 0/45/90° rotations
+for the layouts with the fewest slivers and cut tiles; enter the
+offset and rotation found to count with them.
+Wall Tiling counts the interior or exterior face of the selected
+walls, with their doors and windows cut out.
+Project Takeoff counts the floor of every room, and optionally the
+room side of its bounding walls, into a CSV file, reusing the last
+result of surfaces that have not changed.
 ________________________________________________________________
 Author: Zwe"""
 
-from pyrevit import forms
+import csv
+
+from pyrevit import revit, forms, script
 from Autodesk.Revit.DB import *
-import datetime
+from Autodesk.Revit.UI.Selection import ObjectType
+
+from Geometry._boundary import boundary_hash, polygon_hash
+from Geometry._framing import local_extents
+from Geometry._packing import boxes_to_order
+from Geometry._tiles import optimise_setting_out
+from Snippets._rooms import get_room_geometry_service
+from Snippets._tiling import (FloorSelectionFilter, WallSelectionFilter, count_surface, floor_top_polygons,
+                              get_takeoff_cache, parse_tile_size, segment_loops_polygon, setting_out_corner,
+                              wall_side_polygons)
+from Snippets._walls import insert_box_corners, inserts_by_host, wall_frame_at
+
+doc = revit.doc
+uidoc = revit.uidoc
+output = script.get_output()
+config = script.get_config()
+
+COUNT = "Count Tiles"
+WALLS = "Wall Tiling"
+OPTIMISE = "Optimise Setting-Out"
+TAKEOFF = "Project Takeoff"
+FLOORS_ONLY = "Room Floors"
+FLOORS_AND_WALLS = "Room Floors and Walls"
+SQFT_TO_M2 = 0.092903
+
+mode = forms.CommandSwitchWindow.show([COUNT, WALLS, OPTIMISE, TAKEOFF], message="Tiles Count mode:")
+if not mode:
+    script.exit()
+
+# --- Step 1: Floors or walls from the pre-selection, or pick them ---
+elements = []
+if mode != TAKEOFF:
+    element_class, selection_filter, label = (Wall, WallSelectionFilter(), "walls") if mode == WALLS \
+        else (Floor, FloorSelectionFilter(), "floors")
+    elements = [doc.GetElement(i) for i in uidoc.Selection.GetElementIds()]
+    elements = [e for e in elements if isinstance(e, element_class)]
+    if not elements:
+        try:
+            refs = uidoc.Selection.PickObjects(ObjectType.Element, selection_filter, "Select {} to tile".format(label))
+        except:
+            script.exit()
+        elements = [doc.GetElement(r) for r in refs]
+    if not elements:
+        forms.alert("No {} selected.".format(label))
+        script.exit()
+
+interior = True
+if mode == WALLS:
+    side = forms.CommandSwitchWindow.show(["Interior Face", "Exterior Face"], message="Tile which face:")
+    if not side:
+        script.exit()
+    interior = side == "Interior Face"
+
+# --- Step 2: Tile settings, remembered between runs ---
+SETTINGS = (("tile_size", "600x600", "Tile size in mm (width x height):", (COUNT, WALLS, OPTIMISE, TAKEOFF)),
+            ("joint_mm", "3", "Joint width in mm:", (COUNT, WALLS, OPTIMISE, TAKEOFF)),
+            ("rotation_deg", "0", "Rotation in degrees:", (COUNT, WALLS, TAKEOFF)),
+            ("offset_mm", "0,0", "Setting-out offset from the face corner in mm (along, across the rows):",
+             (COUNT, WALLS, TAKEOFF)),
+            ("tiles_per_box", "4", "Tiles per box:", (COUNT, WALLS, TAKEOFF)),
+            ("waste_pct", "5", "Waste allowance in %:", (COUNT, WALLS, TAKEOFF)))
+settings = {}
+for option, default, prompt, modes in SETTINGS:
+    value = config.get_option(option, default)
+    if mode in modes:
+        value = forms.ask_for_string(default=value, prompt=prompt)
+        if value is None:
+            script.exit()
+    settings[option] = value
+try:
+    tile_w, tile_h = parse_tile_size(settings["tile_size"])
+    joint = float(settings["joint_mm"]) / 304.8
+    rotation = float(settings["rotation_deg"])
+    offset = tuple(float(v) / 304.8 for v in settings["offset_mm"].split(","))
+    if len(offset) != 2:
+        raise ValueError("Offset needs an along and an across value.")
+    per_box = int(settings["tiles_per_box"])
+    waste = float(settings["waste_pct"]) / 100.0
+    if per_box <= 0:
+        raise ValueError("Tiles per box must be positive.")
+except ValueError:
+    forms.alert("Invalid tile size, joint, rotation, offset, tiles per box or waste.")
+    script.exit()
+for option, value in settings.items():
+    setattr(config, option, value)
+script.save_config()
+
+# Slivers: cut pieces thinner than this; saw cut added to every reused piece (pyRevit config, mm)
+min_piece = float(config.get_option("sliver_mm", 50)) / 304.8
+cut_allowance = float(config.get_option("cut_allowance_mm", 2)) / 304.8
+
+if mode == OPTIMISE:
+    # --- Step 3: Best setting-out per face ---
+    output.print_md("### Best setting-out for {} mm tiles, joint {} mm (slivers < {:.0f} mm)".format(
+        settings["tile_size"], settings["joint_mm"], min_piece * 304.8))
+    for floor in elements:
+        for polygon in floor_top_polygons(floor):
+            best = optimise_setting_out(polygon, tile_w, tile_h, joint, min_size=min_piece,
+                                        base_origin=setting_out_corner(polygon))
+            rows = [["{:.0f}°".format(o.rotation), "{:.0f}".format(o.offset[0] * 304.8),
+                     "{:.0f}".format(o.offset[1] * 304.8), o.full, o.cut, o.slivers] for o in best]
+            output.print_md("**Floor {}**".format(output.linkify(floor.Id)))
+            output.print_table(rows, columns=["Rotation", "Offset along (mm)", "Offset across (mm)",
+                                              "Full", "Cut", "Slivers"])
+    script.exit()
+
+
+def opening_rects(walls, frames):
+    """{wall id integer: [(u0, u1, w0, w1)]} of the doors and windows in walls.
+
+    Inserts are fetched for all walls in one collector and sized in one
+    local_extents batch, in each host's wall frame."""
+    hosted = inserts_by_host(doc, [w.Id for w in walls])
+    hosts, opening_frames, opening_corners = [], [], []
+    for host_id, insts in hosted.items():
+        if frames.get(host_id) is None:
+            continue
+        for inst in insts:
+            corners = insert_box_corners(inst)
+            if corners:
+                hosts.append(host_id)
+                opening_frames.append(frames[host_id])
+                opening_corners.append(corners)
+    rects_by_wall = {}
+    for host_id, (u0, u1, _, _, w0, w1) in zip(hosts, local_extents(opening_frames, opening_corners)):
+        rects_by_wall.setdefault(host_id, []).append((u0, u1, w0, w1))
+    return rects_by_wall
+
+
+def room_param(room, bip):
+    param = room.get_Parameter(bip)
+    return (param.AsString() if param else None) or ""
+
+
+if mode == TAKEOFF:
+    # --- Step 3: Every room's floor and, optionally, the room side of its bounding walls,
+    # streamed to CSV, unchanged surfaces from the cache ---
+    scope = forms.CommandSwitchWindow.show([FLOORS_ONLY, FLOORS_AND_WALLS], message="Take off:")
+    if not scope:
+        script.exit()
+    path = forms.save_file(file_ext="csv", default_name="Tile Takeoff")
+    if not path:
+        script.exit()
+    rooms = [r for r in FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Rooms)
+             .WhereElementIsNotElementType() if r.Location and r.Area > 0]
+    room_geometry, geometry_errors = get_room_geometry_service(doc).get_all(rooms)
+    cache = get_takeoff_cache(doc)
+    params = (round(tile_w, 6), round(tile_h, 6), round(joint, 6), rotation, round(offset[0], 6),
+              round(offset[1], 6), round(cut_allowance, 6))
+
+    # Bounding walls of every room, their frames and openings in one batch
+    walls_by_room, frames, rects_by_wall = {}, {}, {}
+    if scope == FLOORS_AND_WALLS:
+        for room_id, g in room_geometry.items():
+            walls = [doc.GetElement(ElementId(eid)) for eid in sorted(g.bounding_ids)]
+            walls_by_room[room_id] = [w for w in walls if isinstance(w, Wall)]
+        walls = list(dict((w.Id.IntegerValue, w) for ws in walls_by_room.values() for w in ws).values())
+        frames = dict((w.Id.IntegerValue, wall_frame_at(w)) for w in walls)
+        rects_by_wall = opening_rects(walls, frames)
+
+    def cached_count(key, digest, make_polygon):
+        """(SurfaceCount, recomputed) of one surface, reused while digest matches."""
+        cached = cache.get(key)
+        if cached and cached[0] == digest:
+            return cached[1], False
+        counts = count_surface(make_polygon(), tile_w, tile_h, joint, rotation, cut_allowance, offset=offset)
+        cache.put(key, (digest, counts))
+        return counts, True
+
+    counted_faces = set()
+
+    def room_surfaces(room):
+        """[(surface, SurfaceCount, recomputed)] of a room's floor and wall faces."""
+        g = room_geometry.get(room.Id.IntegerValue)
+        if g is None:
+            raise Exception(geometry_errors.get(room.Id.IntegerValue, "Room boundary could not be read."))
+        loops = g.loops
+        surfaces = [("Floor",) + cached_count((room.Id.IntegerValue, "Floor"), boundary_hash(loops, params),
+                                              lambda: segment_loops_polygon(loops))]
+        point = room.Location.Point
+        for wall in walls_by_room.get(room.Id.IntegerValue, []):
+            frame = frames.get(wall.Id.IntegerValue)
+            if frame is None:
+                continue  # only straight walls are tiled
+            # The side facing the room; Orientation points to the wall's exterior
+            interior = (point - XYZ(*frame.origin)).DotProduct(wall.Orientation) < 0
+            face_key = (wall.Id.IntegerValue, interior)
+            if face_key in counted_faces:
+                continue  # the same face bounds another room already counted
+            counted_faces.add(face_key)
+            # One odd wall (stacked, no side faces) is skipped on its own, not with the room
+            try:
+                polygons = wall_side_polygons(wall, frame, interior, rects_by_wall.get(wall.Id.IntegerValue, []))
+                wall_surfaces = [("Wall {}".format(wall.Id.IntegerValue),) + cached_count(
+                    face_key + (i,), polygon_hash(polygon, params), lambda: polygon)
+                    for i, polygon in enumerate(polygons)]
+            except Exception as e:
+                skipped_walls.append((wall.Id, str(e)))
+                continue
+            surfaces.extend(wall_surfaces)
+        return surfaces
 
+    recomputed, failures, skipped_walls = 0, [], []
+    totals = [0, 0, 0.0, 0]  # full, cut, area (m2), net tiles
+    with open(path, "wb") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Room", "Surface", "Tile Type", "Full", "Cut", "Area (m2)", "Boxes"])
+        for room in rooms:
+            try:
+                surfaces = room_surfaces(room)
+            except Exception as e:
+                failures.append((room.Id, str(e)))
+                continue
+            label = "{} - {}".format(room.Number, room_param(room, BuiltInParameter.ROOM_NAME))
+            for surface, counts, fresh in surfaces:
+                finish = room_param(room, BuiltInParameter.ROOM_FINISH_FLOOR if surface == "Floor"
+                                    else BuiltInParameter.ROOM_FINISH_WALL)
+                net = counts.full + counts.cut_tiles
+                writer.writerow([label, surface, finish or settings["tile_size"], counts.full, counts.cut,
+                                 "{:.2f}".format(counts.area * SQFT_TO_M2), boxes_to_order(net, per_box, waste)])
+                recomputed += fresh
+                totals[0] += counts.full
+                totals[1] += counts.cut
+                totals[2] += counts.area * SQFT_TO_M2
+                totals[3] += net
+        # Boxes for the whole project from the summed tiles, not the sum of per-surface round-ups
+        boxes = boxes_to_order(totals[3], per_box, waste)
+        writer.writerow(["Total", "", "", totals[0], totals[1], "{:.2f}".format(totals[2]), boxes])
 
-uidoc = __revit__.ActiveUIDocument
-doc = uidoc.Document
+    output.print_md("### Tile takeoff: {} rooms, {} surface(s) recomputed".format(
+        len(rooms) - len(failures), recomputed))
+    output.print_md("**{} full + {} cut tiles over {:.2f} m², {} net tiles, {} boxes**".format(
+        totals[0], totals[1], totals[2], totals[3], boxes))
+    output.print_md("Saved to `{}`".format(path))
+    if failures:
+        output.print_md("### ❌ {} room(s) skipped".format(len(failures)))
+        for room_id, message in failures:
+            print("{} {}".format(output.linkify(room_id), message))
+    if skipped_walls:
+        output.print_md("### ❌ {} wall(s) skipped".format(len(skipped_walls)))
+        for wall_id, message in skipped_walls:
+            print("{} {}".format(output.linkify(wall_id), message))
+    script.exit()
 
-forms.alert("🙄 Work in progress!!!")
+# --- Step 3: Surfaces; wall openings in wall-local coordinates, all inserts in one batch ---
+surfaces, skipped = [], []
+if mode == WALLS:
+    frames = dict((w.Id.IntegerValue, wall_frame_at(w)) for w in elements)
+    rects_by_wall = opening_rects(elements, frames)
+    for wall in elements:
+        frame = frames[wall.Id.IntegerValue]
+        if frame is None:
+            skipped.append((wall.Id, "Only straight walls can be tiled."))
+            continue
+        try:
+            polygons = wall_side_polygons(wall, frame, interior, rects_by_wall.get(wall.Id.IntegerValue, []))
+        except Exception as e:
+            skipped.append((wall.Id, str(e)))
+            continue
+        surfaces.extend((wall, polygon) for polygon in polygons)
+else:
+    surfaces = [(floor, polygon) for floor in elements for polygon in floor_top_polygons(floor)]
 
+# --- Step 4: Lay out tiles from the offset corner of each face's bounding box, reuse offcuts ---
+rows = []
+totals = [0, 0, 0, 0.0]
+for element, polygon in surfaces:
+    counts = count_surface(polygon, tile_w, tile_h, joint, rotation, cut_allowance, offset=offset)
+    rows.append([output.linkify(element.Id), counts.full, counts.cut, counts.cut_tiles,
+                 counts.full + counts.cut_tiles, "{:.2f}".format(counts.offcut_area * SQFT_TO_M2)])
+    totals[0] += counts.full
+    totals[1] += counts.cut
+    totals[2] += counts.cut_tiles
+    totals[3] += counts.offcut_area * SQFT_TO_M2
 
+# --- Step 5: Report ---
+net = totals[0] + totals[2]
+output.print_md("### Tiles {} mm, joint {} mm, rotation {}°, offset {} mm".format(
+    settings["tile_size"], settings["joint_mm"], settings["rotation_deg"], settings["offset_mm"]))
+output.print_table(rows, columns=["Wall" if mode == WALLS else "Floor", "Full", "Cut pieces", "Tiles for cuts", "Net tiles", "Offcut waste (m²)"])
+output.print_md("**Net: {} full + {} for {} cut pieces = {} tiles, {:.2f} m² offcut**".format(
+    totals[0], totals[2], totals[1], net, totals[3]))
+output.print_md("**Order: {} boxes of {} (incl. {}% waste)**".format(
+    boxes_to_order(net, per_box, waste), per_box, settings["waste_pct"]))
+if skipped:
+    output.print_md("### ❌ {} wall(s) skipped".format(len(skipped)))
+    for element_id, message in skipped:
+        print("{} {}".format(output.linkify(element_id), message))
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets import _facecache, _grids, _rooms, _walls
+
+#--------------------------------------------------
+#📦 Variables
+args = __eventargs__   # Autodesk.Revit.DB.Events.DocumentChangedEventArgs
+
+#--------------------------------------------------
+#🎯 MAIN
+# Keep the Dimension+ and room caches in step with the model.
+_facecache.on_document_changed(args)
+_walls.on_document_changed(args)
+_grids.on_document_changed(args)
+_rooms.on_document_changed(args)
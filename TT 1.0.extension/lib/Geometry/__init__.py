@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""Pure-Python geometry helpers used by the TT 1.0 tools.
+
+Nothing in this package imports the Revit API, so every module can be
+imported and exercised outside Revit on plain coordinate tuples."""
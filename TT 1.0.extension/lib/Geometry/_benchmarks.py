@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Headless benchmarks for the TT 1.0 geometry code paths.
+
+Run from the lib folder:  python -m Geometry._benchmarks"""
+import math
+import random
+import time
+
+from Geometry._packing import first_fit_decreasing
+from Geometry._tiles import layout_tiles, optimise_setting_out
+
+
+# ╔═╗╔═╗╔═╗╔═╗  ╦═╗╔═╗╔═╗╔═╗
+# ╠╣ ╠═╣║  ║╣   ╠╦╝║╣ ╠╣ ╚═╗
+# ╚  ╩ ╩╚═╝╚═╝  ╩╚═╚═╝╚  ╚═╝ WALL FACE REFERENCES
+#==================================================
+class _Face(object):
+    """Synthetic stand-in for a Revit face: a planar vertex loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.adjacent = []
+
+    def compute_normal(self):
+        # Newell's method, the per-face cost the solid walk pays.
+        nx = ny = nz = 0.0
+        pts = self.loop
+        for i, a in enumerate(pts):
+            b = pts[(i + 1) % len(pts)]
+            nx += (a[1] - b[1]) * (a[2] + b[2])
+            ny += (a[2] - b[2]) * (a[0] + b[0])
+            nz += (a[0] - b[0]) * (a[1] + b[1])
+        length = math.sqrt(nx * nx + ny * ny + nz * nz) or 1.0
+        return (nx / length, ny / length, nz / length)
+
+
+def _box_faces(x0, y0, z0, x1, y1, z1):
+    return {
+        "ext": _Face([(x0, y0, z0), (x1, y0, z0), (x1, y0, z1), (x0, y0, z1)]),
+        "int": _Face([(x0, y1, z0), (x0, y1, z1), (x1, y1, z1), (x1, y1, z0)]),
+        "end0": _Face([(x0, y0, z0), (x0, y0, z1), (x0, y1, z1), (x0, y1, z0)]),
+        "end1": _Face([(x1, y0, z0), (x1, y1, z0), (x1, y1, z1), (x1, y0, z1)]),
+        "top": _Face([(x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1)]),
+        "bottom": _Face([(x0, y0, z0), (x0, y1, z0), (x1, y1, z0), (x1, y0, z0)]),
+    }
+
+
+def synthetic_walls(count=5000, seed=7):
+    """Walls as dicts of faces; openings and joins add extra solid faces."""
+    rng = random.Random(seed)
+    walls = []
+    for _ in range(count):
+        x0, length = rng.uniform(0, 1000), rng.uniform(3, 30)
+        faces = _box_faces(x0, 0.0, 0.0, x0 + length, 0.66, 10.0)
+        extra = []
+        for _ in range(rng.randint(0, 3)):  # openings: jambs, head and sill
+            ox = rng.uniform(x0, x0 + length - 1)
+            extra.append(_Face([(ox, 0, 0), (ox, 0.66, 0), (ox, 0.66, 7), (ox, 0, 7)]))
+            extra.append(_Face([(ox + 1, 0, 0), (ox + 1, 0, 7), (ox + 1, 0.66, 7), (ox + 1, 0.66, 0)]))
+            extra.append(_Face([(ox, 0, 7), (ox + 1, 0, 7), (ox + 1, 0.66, 7), (ox, 0.66, 7)]))
+            extra.append(_Face([(ox, 0, 0), (ox, 0.66, 0), (ox + 1, 0.66, 0), (ox + 1, 0, 0)]))
+        for _ in range(rng.randint(0, 4)):  # join clean-up slivers
+            extra.append(_Face([(x0, 0, 0), (x0 + 0.1, 0.3, 0), (x0 + 0.1, 0.3, 10)]))
+        faces["ext"].adjacent = [faces["end0"], faces["end1"], faces["top"], faces["bottom"]] + extra[:2]
+        solid = list(faces.values()) + extra
+        walls.append({"faces": faces, "solid": solid, "complex": rng.random() < 0.05})
+    return walls
+
+
+def _parallel(n, axis, tol=1e-9):
+    return abs(abs(n[0] * axis[0] + n[1] * axis[1] + n[2] * axis[2]) - 1.0) < tol
+
+
+def solid_walk(wall, axis):
+    return [f for f in wall["solid"] if _parallel(f.compute_normal(), axis)]
+
+
+def side_face_path(wall, axis):
+    if wall["complex"]:
+        return solid_walk(wall, axis)
+    faces = wall["faces"]
+    found = [faces["ext"], faces["int"]]
+    found.extend(f for f in faces["ext"].adjacent if _parallel(f.compute_normal(), axis))
+    return found
+
+
+def bench_wall_face_paths(count=5000, repeat=3):
+    walls = synthetic_walls(count)
+    results = {}
+    for name, fn in (("solid walk", solid_walk), ("side faces", side_face_path)):
+        best = None
+        for _ in range(repeat):
+            start = time.time()
+            for w in walls:
+                fn(w, (1.0, 0.0, 0.0))
+                fn(w, (0.0, 1.0, 0.0))
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best
+    return results
+
+
+# ╔╦╗╦╦  ╔═╗╔═╗
+#  ║ ║║  ║╣ ╚═╗
+#  ╩ ╩╩═╝╚═╝╚═╝ TILE LAYOUT
+#==================================================
+def synthetic_floor(width=400.0, depth=300.0, columns=200, seed=7):
+    """A large floor plate with a notched corner and square column holes."""
+    rng = random.Random(seed)
+    outer = [(0, 0), (width, 0), (width, depth * 0.6), (width * 0.7, depth * 0.6),
+             (width * 0.7, depth), (0, depth)]
+    holes = []
+    for _ in range(columns):
+        x, y = rng.uniform(2, width * 0.65), rng.uniform(2, depth - 4)
+        holes.append([(x, y), (x + 1.5, y), (x + 1.5, y + 1.5), (x, y + 1.5)])
+    return [outer] + holes
+
+
+def bench_tile_layout(repeat=3):
+    """Best time per layout of a ~30k tile floor at 0° and 45°."""
+    floor = synthetic_floor()
+    tile = 600 / 304.8
+    joint = 3 / 304.8
+    results = {}
+    for rotation in (0.0, 45.0):
+        best = None
+        for _ in range(repeat):
+            start = time.time()
+            layout = layout_tiles(floor, tile, tile, joint, rotation, (0.0, 0.0))
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results["tiles {:>4.0f}°".format(rotation)] = (best, layout.full + layout.cut)
+    return results
+
+
+def bench_setting_out():
+    """One optimiser run over an L-shaped 60 m² room with 300x600 tiles."""
+    room = [[(0, 0), (30, 0), (30, 16), (18, 16), (18, 26), (0, 26)]]
+    start = time.time()
+    optimise_setting_out(room, 300 / 304.8, 600 / 304.8, 3 / 304.8)
+    return time.time() - start
+
+
+def bench_offcut_packing(count=300000, seed=7):
+    """First-fit-decreasing of a building's worth of cut pieces."""
+    rng = random.Random(seed)
+    tile = 600 / 304.8
+    sizes = [rng.uniform(0.02, tile) for _ in range(count)]
+    start = time.time()
+    bins = first_fit_decreasing(sizes, tile)
+    return time.time() - start, len(bins)
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(bench_wall_face_paths().items()):
+        print("{:<12} {:8.1f} ms / 5000 walls".format(name, seconds * 1000))
+    for name, (seconds, tiles) in sorted(bench_tile_layout().items()):
+        print("{:<12} {:8.1f} ms / {} tiles".format(name, seconds * 1000, tiles))
+    print("{:<12} {:8.1f} ms / room".format("setting-out", bench_setting_out() * 1000))
+    seconds, tiles = bench_offcut_packing()
+    print("{:<12} {:8.1f} ms / 300000 pieces into {} tiles".format("offcuts", seconds * 1000, tiles))
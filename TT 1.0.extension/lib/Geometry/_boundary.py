@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""Room boundary loops: segment simplification and loop ordering.
+
+A loop is a list of Segment tuples joined end to start. Points are
+(x, y, z) tuples; all tests are made in plan (XY)."""
+import hashlib
+import math
+from collections import namedtuple
+
+DEFAULT_TOLERANCE = 1.0 / 304.8  # 1 mm in feet
+
+# kind: "line", "arc" or "curve" (any other curve, never merged)
+# mid: a point on the segment between start and end (arcs)
+# source: the original curve object, kept while the segment is unchanged
+Segment = namedtuple("Segment", ["kind", "start", "end", "centre", "radius", "mid", "source"])
+
+
+def line(start, end, source=None):
+    return Segment("line", tuple(start), tuple(end), None, None, None, source)
+
+
+def arc(start, end, centre, radius, mid, source=None):
+    return Segment("arc", tuple(start), tuple(end), tuple(centre), radius, tuple(mid), source)
+
+
+def other(start, end, source):
+    return Segment("curve", tuple(start), tuple(end), None, None, None, source)
+
+
+def _dist(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def segment_length(seg):
+    if seg.kind == "arc":
+        # chord lengths through the mid point are close enough for tolerance tests
+        return _dist(seg.start, seg.mid) + _dist(seg.mid, seg.end)
+    return _dist(seg.start, seg.end)
+
+
+def _line_distance(pt, start, end):
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return _dist(pt, start)
+    return abs((pt[0] - start[0]) * dy - (pt[1] - start[1]) * dx) / length
+
+
+def _merge(a, b, tolerance):
+    """Single segment equivalent to a followed by b, or None."""
+    if a.kind == "line" and b.kind == "line":
+        if _line_distance(b.end, a.start, a.end) > tolerance or \
+                _line_distance(a.start, b.start, b.end) > tolerance:
+            return None
+        da = (a.end[0] - a.start[0], a.end[1] - a.start[1])
+        db = (b.end[0] - b.start[0], b.end[1] - b.start[1])
+        if da[0] * db[0] + da[1] * db[1] <= 0:
+            return None
+        return line(a.start, b.end)
+    if a.kind == "arc" and b.kind == "arc":
+        if _dist(a.centre, b.centre) > tolerance or abs(a.radius - b.radius) > tolerance:
+            return None
+        # Same sweep direction: the mids lie on the same side of their chords
+        if _side(a.start, a.end, a.mid) * _side(b.start, b.end, b.mid) <= 0:
+            return None
+        if _dist(a.start, b.end) <= tolerance:
+            return None  # would close into a full circle
+        return arc(a.start, b.end, a.centre, a.radius, a.end)
+    return None
+
+
+def _side(start, end, pt):
+    return (end[0] - start[0]) * (pt[1] - start[1]) - (end[1] - start[1]) * (pt[0] - start[0])
+
+
+def _drop_short(segments, tolerance):
+    """Remove segments shorter than tolerance, closing the gap on a neighbouring line."""
+    result = list(segments)
+    i = 0
+    while i < len(result) and len(result) > 3:
+        seg = result[i]
+        if segment_length(seg) >= tolerance:
+            i += 1
+            continue
+        nxt_i = (i + 1) % len(result)
+        prv_i = (i - 1) % len(result)
+        nxt, prv = result[nxt_i], result[prv_i]
+        if nxt.kind == "line":
+            result[nxt_i] = line(seg.start, nxt.end)
+        elif prv.kind == "line":
+            result[prv_i] = line(prv.start, seg.end)
+        else:
+            i += 1
+            continue
+        del result[i]
+    return result
+
+
+def simplify_loop(segments, tolerance=DEFAULT_TOLERANCE):
+    """Merge collinear lines and co-circular arcs, drop sliver segments.
+
+    Segments that survive unchanged keep their source curve."""
+    segments = _drop_short(segments, tolerance)
+    if len(segments) < 2:
+        return list(segments)
+    # Start at a corner so the wrap-around join is never a mergeable one
+    start = 0
+    for i in range(len(segments)):
+        if _merge(segments[i - 1], segments[i], tolerance) is None:
+            start = i
+            break
+    ordered = segments[start:] + segments[:start]
+
+    merged = [ordered[0]]
+    for seg in ordered[1:]:
+        joined = _merge(merged[-1], seg, tolerance)
+        if joined is None:
+            merged.append(seg)
+        else:
+            merged[-1] = joined
+    if len(merged) > 1:
+        joined = _merge(merged[-1], merged[0], tolerance)
+        if joined is not None:
+            merged[0] = joined
+            merged.pop()
+    return merged
+
+
+def loop_points(segments):
+    points = []
+    for seg in segments:
+        points.append(seg.start)
+        if seg.mid is not None:
+            points.append(seg.mid)
+    return points
+
+
+def signed_area(points):
+    """Shoelace area in plan; positive for counter-clockwise loops."""
+    area = 0.0
+    for i, a in enumerate(points):
+        b = points[(i + 1) % len(points)]
+        area += a[0] * b[1] - b[0] * a[1]
+    return area / 2.0
+
+
+def order_loops(loops):
+    """Loops with the outer boundary (largest area) first."""
+    return sorted(loops, key=lambda lp: -abs(signed_area(loop_points(lp))))
+
+
+def boundary_hash(loops, extra=(), digits=4):
+    """Stable hash of simplified loops plus any extra values (level, offset...).
+
+    Coordinates are rounded to digits decimals (feet) so that numerical
+    noise between runs does not register as a change."""
+    def fmt(pt):
+        return ",".join("%.*f" % (digits, round(c, digits) + 0.0) for c in pt)
+
+    parts = []
+    for lp in loops:
+        for seg in lp:
+            parts.append(seg.kind + ":" + fmt(seg.start) + ">" + fmt(seg.end) +
+                         ("~" + fmt(seg.mid) if seg.mid is not None else ""))
+        parts.append("/")
+    parts.append("|".join(str(e) for e in extra))
+    return hashlib.md5(";".join(parts).encode("utf-8")).hexdigest()
+
+
+def polygon_hash(loops, extra=(), digits=4):
+    """boundary_hash for point loops (e.g. tessellated faces) instead of Segments."""
+    parts = [";".join("%.*f,%.*f" % (digits, round(p[0], digits) + 0.0, digits, round(p[1], digits) + 0.0)
+                      for p in lp) for lp in loops]
+    parts.append("|".join(str(e) for e in extra))
+    return hashlib.md5("/".join(parts).encode("utf-8")).hexdigest()
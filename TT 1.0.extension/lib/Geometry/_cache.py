@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Bounded caches."""
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Least-recently-used cache with explicit invalidation.
+
+    get() and put() refresh an entry; once more than capacity entries are
+    held the oldest one is dropped and passed to on_evict(key, value).
+    invalidate() removes the given keys, typically the ids reported by a
+    DocumentChanged event."""
+
+    def __init__(self, capacity=4000, on_evict=None):
+        self.capacity = int(capacity)
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            self.misses += 1
+            return default
+        value = self._data.pop(key)
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self._data:
+            del self._data[key]
+        self._data[key] = value
+        while len(self._data) > self.capacity:
+            old_key, old_value = self._data.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
+
+    def get_or_create(self, key, factory):
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def values(self):
+        return list(self._data.values())
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def invalidate(self, keys):
+        removed = 0
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+    def clear(self):
+        self._data.clear()
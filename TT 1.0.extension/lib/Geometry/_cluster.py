@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Clustering of coordinates and directions for dimension strings."""
+import math
+
+DEFAULT_TOLERANCE = 1.0 / 304.8  # 1 mm in feet
+
+
+def cluster_sorted(items, tolerance=DEFAULT_TOLERANCE, key=lambda item: item[0]):
+    """Sort-and-sweep items into clusters whose keys lie within tolerance.
+
+    A new cluster starts whenever the gap to the previous item exceeds
+    tolerance, so chains of near-equal values merge into one cluster.
+    Returns a list of lists in ascending key order."""
+    clusters = []
+    last = None
+    for item in sorted(items, key=key):
+        value = key(item)
+        if last is None or value - last > tolerance:
+            clusters.append([item])
+        else:
+            clusters[-1].append(item)
+        last = value
+    return clusters
+
+
+def dedupe_references(ref_data, tolerance=DEFAULT_TOLERANCE, key=lambda item: item[0]):
+    """Keep one canonical item per plane from (coord, reference, ...) tuples.
+
+    The first item of each cluster (the lowest coordinate) is kept, which
+    removes the zero-length segments coplanar faces would add."""
+    return [cluster[0] for cluster in cluster_sorted(ref_data, tolerance, key)]
+
+
+def direction_angle(dx, dy):
+    """Undirected angle of (dx, dy) in degrees, in [0, 180)."""
+    angle = math.degrees(math.atan2(dy, dx)) % 180.0
+    return 0.0 if angle >= 180.0 - 1e-9 else angle
+
+
+def angle_difference(a, b):
+    """Smallest difference between two undirected angles in degrees."""
+    diff = abs(a - b) % 180.0
+    return min(diff, 180.0 - diff)
+
+
+def group_by_direction(items, direction, max_spread_deg=0.5):
+    """Group items into parallel families by the angle of direction(item).
+
+    Angles are swept in order, starting after the widest gap between
+    neighbouring angles (so a family near 0/180 is not split by the wrap).
+    Each family is seeded by its smallest angle and takes members up to
+    max_spread_deg from that seed; a gradually turning run of walls
+    therefore starts a new family instead of chaining into one that
+    spans several degrees. Returns a list of (angle, [items]) with the
+    family angle taken as the mean of its members."""
+    members = []
+    for item in items:
+        d = direction(item)
+        if d is not None:
+            members.append((direction_angle(d[0], d[1]), item))
+    if not members:
+        return []
+    members.sort(key=lambda m: m[0])
+
+    # Rotate the sequence to begin after the widest (circular) gap, then unwrap
+    gaps = [(members[i][0] - members[i - 1][0]) % 180.0 for i in range(len(members))]
+    start = max(range(len(members)), key=lambda i: gaps[i]) if len(members) > 1 else 0
+    ordered = members[start:] + [(a + 180.0, item) for a, item in members[:start]]
+
+    families = []
+    seed = None
+    for angle, item in ordered:
+        if seed is None or angle - seed > max_spread_deg:
+            seed = angle
+            families.append([])
+        families[-1].append((angle, item))
+    return [((sum(a for a, _ in family) / len(family)) % 180.0, [item for _, item in family])
+            for family in families]
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Wall-local coordinate frames.
+
+A frame has its origin on the wall's location line, u along the wall
+direction, v along the wall normal (through the thickness) and w up.
+Points are (x, y, z) tuples."""
+import math
+from collections import namedtuple
+
+from Geometry._intervals import union_intervals
+
+WallFrame = namedtuple("WallFrame", ["origin", "u", "v", "w"])
+
+SIDES = ("left", "right", "top", "bottom")
+
+
+def wall_frame(start, end):
+    """Frame of a straight wall from its location line end points."""
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length = math.hypot(dx, dy)
+    u = (dx / length, dy / length, 0.0)
+    return WallFrame(tuple(start), u, (-u[1], u[0], 0.0), (0.0, 0.0, 1.0))
+
+
+def local_extents(frames, corner_sets):
+    """Bulk box extents in each box's own wall frame.
+
+    frames[i] and corner_sets[i] (any number of world points, usually the
+    8 corners of an oriented bounding box) belong to the same opening.
+    Returns one (u0, u1, v0, v1, w0, w1) per opening: true width along
+    the wall, depth through it and height, independent of wall angle and
+    view."""
+    result = []
+    for frame, corners in zip(frames, corner_sets):
+        ox, oy, oz = frame.origin
+        ux, uy, _ = frame.u
+        vx, vy, _ = frame.v
+        us, vs, ws = [], [], []
+        for x, y, z in corners:
+            x, y = x - ox, y - oy
+            us.append(x * ux + y * uy)
+            vs.append(x * vx + y * vy)
+            ws.append(z - oz)
+        result.append((min(us), max(us), min(vs), max(vs), min(ws), max(ws)))
+    return result
+
+
+def grout_rect(extent, sides, thickness):
+    """(u0, u1, w0, w1) of an opening grown by thickness on the chosen sides.
+
+    left is towards the wall start, right towards its end."""
+    u0, u1, _, _, w0, w1 = extent
+    if "left" in sides:
+        u0 -= thickness
+    if "right" in sides:
+        u1 += thickness
+    if "bottom" in sides:
+        w0 -= thickness
+    if "top" in sides:
+        w1 += thickness
+    return (u0, u1, w0, w1)
+
+
+def to_world(frame, u, v, w):
+    ox, oy, oz = frame.origin
+    return (ox + u * frame.u[0] + v * frame.v[0],
+            oy + u * frame.u[1] + v * frame.v[1],
+            oz + w)
+
+
+GroutRect = namedtuple("GroutRect", ["u0", "u1", "w0", "w1", "v0", "v1", "keys", "part"])
+
+
+def _snap(values, tolerance):
+    """Sorted values, dropping any within tolerance of the last one kept."""
+    kept = []
+    for x in sorted(values):
+        if not kept or x - kept[-1] > tolerance:
+            kept.append(x)
+    return kept
+
+
+def _same_spans(a, b, tolerance):
+    return len(a) == len(b) and all(abs(p[0] - q[0]) <= tolerance and abs(p[1] - q[1]) <= tolerance
+                                    for p, q in zip(a, b))
+
+
+def rect_union(rects, tolerance=1.0 / 304.8):
+    """Disjoint (u0, u1, w0, w1) rectangles covering the union of rects.
+
+    The union is cut into vertical slabs at every u edge, the w spans of
+    each slab are unioned, and neighbouring slabs with matching spans are
+    joined again. Edges and spans closer than tolerance count as equal.
+    Overlapping openings then become holes that an even-odd fill does not
+    toggle back on."""
+    us = _snap([u for r in rects for u in r[:2]], tolerance)
+    columns = []
+    for a, b in zip(us, us[1:]):
+        mid = (a + b) * 0.5
+        spans = union_intervals([(r[2], r[3]) for r in rects if r[0] <= mid <= r[1]], gap=tolerance)
+        if columns and columns[-1][1] == a and _same_spans(columns[-1][2], spans, tolerance):
+            columns[-1][1] = b
+        elif spans:
+            columns.append([a, b, spans])
+    return [(a, b, lo, hi) for a, b, spans in columns for lo, hi in spans]
+
+
+def _touch(a, b, tolerance):
+    return (a.u0 <= b.u1 + tolerance and b.u0 <= a.u1 + tolerance and
+            a.w0 <= b.w1 + tolerance and b.w0 <= a.w1 + tolerance)
+
+
+def merge_rects(rects, tolerance=1.0 / 304.8):
+    """Disjoint GroutRects covering exactly the union of rects.
+
+    Rectangles in one wall frame that overlap or touch form a group, so a
+    ribbon window collapses to one void and a door with a taller or
+    shorter sidelight to one void per height. Every piece of a group
+    carries the keys of the whole group and its own part index."""
+    groups = []
+    for r in rects:
+        joined = [g for g in groups if any(_touch(r, m, tolerance) for m in g)]
+        for g in joined:
+            groups.remove(g)
+        groups.append([r] + [m for g in joined for m in g])
+    merged = []
+    for members in groups:
+        keys = tuple(sorted(k for r in members for k in r.keys))
+        v0, v1 = min(r.v0 for r in members), max(r.v1 for r in members)
+        pieces = rect_union([(r.u0, r.u1, r.w0, r.w1) for r in members], tolerance)
+        for part, (u0, u1, w0, w1) in enumerate(sorted(pieces)):
+            merged.append(GroutRect(u0, u1, w0, w1, v0, v1, keys, part))
+    return sorted(merged)
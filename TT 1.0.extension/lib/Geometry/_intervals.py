@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""1D interval arithmetic on (lo, hi) tuples."""
+
+
+def union_intervals(intervals, gap=0.0):
+    """Merge overlapping intervals, and those closer than gap; sorted result."""
+    merged = []
+    for lo, hi in sorted(intervals):
+        if merged and lo - merged[-1][1] <= gap:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def subtract_intervals(span, holes, min_length=0.0):
+    """Parts of span not covered by holes, dropping pieces shorter than min_length."""
+    lo, hi = span
+    pieces = []
+    cursor = lo
+    for h_lo, h_hi in union_intervals(holes):
+        if h_hi <= cursor or h_lo >= hi:
+            continue
+        if h_lo - cursor > min_length:
+            pieces.append((cursor, h_lo))
+        cursor = max(cursor, h_hi)
+    if hi - cursor > min_length:
+        pieces.append((cursor, hi))
+    return pieces
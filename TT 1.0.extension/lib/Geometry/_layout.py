@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Placement of dimension strings so they do not collide."""
+import heapq
+
+
+def assign_tracks(intervals, clearance=0.0):
+    """Greedy interval partitioning of (lo, hi) spans onto tracks.
+
+    Spans are taken in order of their start and placed on the lowest free
+    track whose previous span ended at least clearance earlier; this uses
+    the minimum number of tracks. Returns one track index per interval,
+    in the input order."""
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+    tracks = [0] * len(intervals)
+    busy = []       # (end, track) of the last span on every used track
+    free = []       # tracks whose last span has been passed
+    used = 0
+    for i in order:
+        lo, hi = intervals[i]
+        while busy and busy[0][0] + clearance <= lo:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            track = heapq.heappop(free)
+        else:
+            track = used
+            used += 1
+        tracks[i] = track
+        heapq.heappush(busy, (hi, track))
+    return tracks
+
+
+def layout_lanes(strings, clearance=0.0):
+    """Assign tracks to strings grouped by lane.
+
+    strings is a list of (lane, lo, hi); strings sharing a lane compete for
+    the same space and are packed with assign_tracks. Returns one track
+    index per string, in the input order."""
+    lanes = {}
+    for i, (lane, lo, hi) in enumerate(strings):
+        lanes.setdefault(lane, []).append(i)
+    tracks = [0] * len(strings)
+    for indexes in lanes.values():
+        lane_tracks = assign_tracks([strings[i][1:] for i in indexes], clearance)
+        for i, track in zip(indexes, lane_tracks):
+            tracks[i] = track
+    return tracks
+
+
+def place_offsets(strings, clearance=0.0):
+    """Offsets for parallel strings that may each sit anywhere past a base.
+
+    strings is a list of (lo, hi, base): the span along the strings and the
+    nearest offset across them a string may take. Strings are placed in
+    order of base, each at the smallest offset >= base that stays clearance
+    away from every placed string whose span overlaps its own, so no two
+    strings collide however close their bases are. Returns one offset per
+    string, in the input order."""
+    order = sorted(range(len(strings)), key=lambda i: (strings[i][2], strings[i][0]))
+    offsets = [0.0] * len(strings)
+    placed = []     # (lo, hi, offset)
+    for i in order:
+        lo, hi, base = strings[i]
+        offset = base
+        for other in sorted(o for p_lo, p_hi, o in placed if p_lo < hi and lo < p_hi):
+            if offset - other >= clearance:
+                continue
+            if other - offset >= clearance:
+                break
+            offset = other + clearance
+        offsets[i] = offset
+        placed.append((lo, hi, offset))
+    return offsets
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Offcut reuse for cut tiles: 1D first-fit-decreasing bin packing."""
+import math
+from collections import namedtuple
+
+EPS = 1e-9
+
+# tiles: whole tiles cut to make the pieces; offcut_area: what is left of them
+CutReuse = namedtuple("CutReuse", ["pieces", "tiles", "offcut_area"])
+
+
+def first_fit_decreasing(sizes, capacity):
+    """Pack 1D sizes into bins of capacity, largest first, each into the
+    first bin it fits. Returns the remaining space of every bin used.
+
+    Bins are leaves of a max tree of remaining space, so the first bin that
+    fits is found in log(n) steps and hundreds of thousands of items pack
+    in one pass. Sizes above capacity take a bin of their own."""
+    n = len(sizes)
+    if not n:
+        return []
+    size = 1
+    while size < n:
+        size *= 2
+    tree = [capacity] * (2 * size)
+    used = 0
+    for s in sorted(sizes, reverse=True):
+        s = min(s, capacity)
+        i = 1
+        while i < size:
+            i = 2 * i if tree[2 * i] >= s - EPS else 2 * i + 1
+        used = max(used, i - size + 1)
+        tree[i] -= s
+        i //= 2
+        while i:
+            space = max(tree[2 * i], tree[2 * i + 1])
+            if tree[i] == space:
+                break  # ancestors are unchanged
+            tree[i] = space
+            i //= 2
+    return tree[size:size + used]
+
+
+def reuse_cut_pieces(pieces, tile_width, tile_height, allowance=0.0):
+    """Whole tiles needed for the cut pieces when offcuts are reused.
+
+    Each tile is cut in strips: pieces at full tile height are packed along
+    the tile width, pieces at full tile width along its height, and pieces
+    cut both ways (corners, skewed edges) take a full-height strip as wide
+    as their bounding box. allowance is added to every piece for the saw
+    cut. pieces are CutPiece records from Geometry._tiles."""
+    along, across = [], []
+    for p in pieces:
+        if p.width >= tile_width - EPS and p.height < tile_height - EPS:
+            across.append(p.height + allowance)
+        else:
+            along.append(p.width + allowance)
+    along_left = first_fit_decreasing(along, tile_width)
+    across_left = first_fit_decreasing(across, tile_height)
+    offcut = sum(along_left) * tile_height + sum(across_left) * tile_width
+    return CutReuse(len(pieces), len(along_left) + len(across_left), offcut)
+
+
+def boxes_to_order(tiles, per_box, waste=0.0):
+    """Boxes for tiles plus a waste fraction (breakage, pattern matching)."""
+    if per_box <= 0:
+        raise ValueError("Tiles per box must be positive.")
+    return int(math.ceil(tiles * (1.0 + waste) / per_box - EPS))
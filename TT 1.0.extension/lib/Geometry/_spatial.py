@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Spatial indexes over plain (x, y, z) tuples."""
+import bisect
+import math
+
+
+def point_segment_distance(pt, start, end):
+    """Distance from pt to the bounded segment start-end (3D)."""
+    dx, dy, dz = end[0] - start[0], end[1] - start[1], end[2] - start[2]
+    px, py, pz = pt[0] - start[0], pt[1] - start[1], pt[2] - start[2]
+    length_sq = dx * dx + dy * dy + dz * dz
+    t = 0.0
+    if length_sq > 0:
+        t = max(0.0, min(1.0, (px * dx + py * dy + pz * dz) / length_sq))
+    ex, ey, ez = px - t * dx, py - t * dy, pz - t * dz
+    return math.sqrt(ex * ex + ey * ey + ez * ez)
+
+
+class WallEndpointIndex(object):
+    """Uniform XY grid over wall location-curve endpoints.
+
+    Each wall is stored under a caller-chosen key (usually the ElementId
+    integer) together with its two endpoints. query_segment() and
+    query_polyline() return the keys of walls with an endpoint within
+    tolerance of the given curve, touching only the grid cells along it."""
+
+    def __init__(self, cell_size=10.0):
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._endpoints = {}
+
+    def __len__(self):
+        return len(self._endpoints)
+
+    def __contains__(self, key):
+        return key in self._endpoints
+
+    def _cell(self, x, y):
+        return (int(math.floor(x / self.cell_size)),
+                int(math.floor(y / self.cell_size)))
+
+    def add(self, key, start, end):
+        if key in self._endpoints:
+            self.remove(key)
+        self._endpoints[key] = (tuple(start), tuple(end))
+        for pt in (start, end):
+            self._cells.setdefault(self._cell(pt[0], pt[1]), set()).add(key)
+
+    def remove(self, key):
+        points = self._endpoints.pop(key, None)
+        if not points:
+            return
+        for pt in points:
+            cell = self._cell(pt[0], pt[1])
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    def endpoints(self, key):
+        return self._endpoints.get(key)
+
+    def _candidates(self, start, end, tolerance):
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        length = math.sqrt(dx * dx + dy * dy)
+        steps = int(math.ceil(length / self.cell_size)) if length else 0
+        ring = int(math.ceil((tolerance + 0.5 * self.cell_size) / self.cell_size))
+        seen_cells = set()
+        found = set()
+        for i in range(steps + 1):
+            t = float(i) / steps if steps else 0.0
+            cx, cy = self._cell(start[0] + t * dx, start[1] + t * dy)
+            for ix in range(cx - ring, cx + ring + 1):
+                for iy in range(cy - ring, cy + ring + 1):
+                    cell = (ix, iy)
+                    if cell in seen_cells:
+                        continue
+                    seen_cells.add(cell)
+                    bucket = self._cells.get(cell)
+                    if bucket:
+                        found.update(bucket)
+        return found
+
+    def query_segment(self, start, end, tolerance=0.01, exclude=None):
+        """Keys of walls with an endpoint within tolerance of start-end."""
+        return self.query_polyline([start, end], tolerance, exclude)
+
+    def query_polyline(self, points, tolerance=0.01, exclude=None):
+        """Keys of walls with an endpoint within tolerance of the polyline.
+
+        Arc walls are queried through their tessellation."""
+        points = [tuple(p) for p in points]
+        if len(points) == 1:
+            points = points * 2
+        result = set()
+        for start, end in zip(points[:-1], points[1:]):
+            for key in self._candidates(start, end, tolerance):
+                if key in result or key == exclude:
+                    continue
+                for pt in self._endpoints[key]:
+                    if point_segment_distance(pt, start, end) < tolerance:
+                        result.add(key)
+                        break
+        return result
+
+
+class NearestIndex(object):
+    """Sorted 1D coordinates answering nearest-value queries by binary search.
+
+    Built from (coord, key) pairs, e.g. the perpendicular coordinates of
+    parallel grid lines."""
+
+    def __init__(self, items):
+        items = sorted(items, key=lambda item: item[0])
+        self._coords = [c for c, _ in items]
+        self._keys = [k for _, k in items]
+
+    def __len__(self):
+        return len(self._coords)
+
+    def nearest(self, coord, max_distance=None):
+        """(coord, key) closest to coord, or None if empty or too far."""
+        if not self._coords:
+            return None
+        i = bisect.bisect_left(self._coords, coord)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(self._coords):
+                if best is None or abs(self._coords[j] - coord) < abs(self._coords[best] - coord):
+                    best = j
+        if max_distance is not None and abs(self._coords[best] - coord) > max_distance:
+            return None
+        return self._coords[best], self._keys[best]
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""Tile layout on a planar polygon: full and cut tile counts.
+
+A polygon is a list of point loops, outer loop first, then holes; each
+loop is a list of (x, y) points (any extra coordinates are ignored) and
+curved edges must already be tessellated. Inside is decided by the
+even-odd rule, so hole orientation does not matter.
+
+Tiles are laid on a grid with one tile corner on the setting-out origin,
+rotated by rotation degrees about it. Rows are handled analytically:
+within a row the polygon's cross-section is a set of x-intervals bounded
+by straight edges, so full and touched tiles are counted as integer index
+ranges and only cut tiles are visited one by one."""
+import math
+from collections import namedtuple
+
+EPS = 1e-9
+
+# row, col: tile index on the grid; area: tiled area of the piece;
+# width, height: extent of the piece along the row and across it
+CutPiece = namedtuple("CutPiece", ["row", "col", "area", "width", "height"])
+TileLayout = namedtuple("TileLayout", ["full", "cut", "cut_area", "pieces"])
+
+
+def _edges(loops, rotation, origin):
+    """Polygon edges in the grid frame as (ymin, ymax, x at ymin, dx/dy)."""
+    ox, oy = origin[0], origin[1]
+    c, s = math.cos(math.radians(rotation)), math.sin(math.radians(rotation))
+    edges = []
+    for loop in loops:
+        pts = [((p[0] - ox) * c + (p[1] - oy) * s, (p[1] - oy) * c - (p[0] - ox) * s) for p in loop]
+        for i, a in enumerate(pts):
+            b = pts[(i + 1) % len(pts)]
+            if abs(a[1] - b[1]) < EPS:
+                continue  # horizontal edges never bound a cross-section
+            if a[1] > b[1]:
+                a, b = b, a
+            edges.append((a[1], b[1], a[0], (b[0] - a[0]) / (b[1] - a[1])))
+    edges.sort()
+    return edges
+
+
+def _row_pairs(active, y0, y1):
+    """Inside spans of one row: (ya, yb, xl_a, xl_b, xr_a, xr_b) per sub-band.
+
+    The row is split at every vertex inside it; in each sub-band the
+    crossing edges are fixed and pair up left/right by the even-odd rule."""
+    cuts = set([y0, y1])
+    for ymin, ymax, _, _ in active:
+        if y0 < ymin < y1:
+            cuts.add(ymin)
+        if y0 < ymax < y1:
+            cuts.add(ymax)
+    cuts = sorted(cuts)
+    bands = []
+    for ya, yb in zip(cuts, cuts[1:]):
+        if yb - ya < EPS:
+            continue
+        ym = (ya + yb) * 0.5
+        xs = sorted((x + (ym - ymin) * k, x + (ya - ymin) * k, x + (yb - ymin) * k)
+                    for ymin, ymax, x, k in active if ymin <= ym <= ymax)
+        pairs = [(ya, yb, l[1], l[2], r[1], r[2]) for l, r in zip(xs[0::2], xs[1::2])]
+        bands.append(pairs)
+    return bands
+
+
+def _union(intervals):
+    merged = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _intersect(a, b):
+    """Intersection of two sorted, disjoint interval lists."""
+    result, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        lo, hi = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        if hi > lo:
+            result.append((lo, hi))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _span_area(ya, yb, xl_a, xl_b, xr_a, xr_b, x0, x1):
+    """Area of the trapezoid between two edges clipped to x0 <= x <= x1.
+
+    The clipped width is piecewise linear in y, so the band is split where
+    either edge crosses x0 or x1 and each piece is integrated exactly."""
+    ts = [0.0, 1.0]
+    for a, b in ((xl_a, xl_b), (xr_a, xr_b)):
+        for x in (x0, x1):
+            if (a - x) * (b - x) < 0:
+                ts.append((x - a) / (b - a))
+    ts.sort()
+
+    def width(t):
+        l = xl_a + (xl_b - xl_a) * t
+        r = xr_a + (xr_b - xr_a) * t
+        return max(0.0, min(r, x1) - max(l, x0))
+
+    area = 0.0
+    for t0, t1 in zip(ts, ts[1:]):
+        area += (width(t0) + width(t1)) * 0.5 * (t1 - t0)
+    return area * (yb - ya)
+
+
+def layout_tiles(loops, tile_width, tile_height, joint=0.0, rotation=0.0, origin=(0.0, 0.0),
+                 keep_pieces=True):
+    """Count full and cut tiles covering the polygon.
+
+    tile_width runs along the rows, tile_height across them; joint is the
+    gap between tiles. Only the tiles themselves are measured, so joints
+    never count as cut area. Returns a TileLayout; pieces is the list of
+    CutPiece records, or None when keep_pieces is False."""
+    px, py = tile_width + joint, tile_height + joint
+    edges = _edges(loops, rotation, origin)
+    if not edges:
+        return TileLayout(0, 0, 0.0, [] if keep_pieces else None)
+    y_lo = min(e[0] for e in edges)
+    y_hi = max(e[1] for e in edges)
+
+    full = cut = 0
+    cut_area = 0.0
+    pieces = [] if keep_pieces else None
+    active, pending = [], 0
+    for row in range(int(math.floor(y_lo / py)), int(math.ceil(y_hi / py)) + 1):
+        y0 = row * py
+        y1 = y0 + tile_height
+        while pending < len(edges) and edges[pending][0] < y1:
+            active.append(edges[pending])
+            pending += 1
+        active = [e for e in active if e[1] > y0]
+        if not active:
+            continue
+        bands = _row_pairs(active, y0, y1)
+
+        # Covered over the whole row height, and anywhere in it; a sub-band
+        # with no inside span (the row runs past the polygon) empties solid.
+        solid = None
+        touched = []
+        for pairs in bands:
+            spans = _union((max(p[2], p[3]), min(p[4], p[5])) for p in pairs if min(p[4], p[5]) > max(p[2], p[3]))
+            solid = spans if solid is None else _intersect(solid, spans)
+            touched.extend((min(p[2], p[3]), max(p[4], p[5])) for p in pairs)
+        touched = _union(touched)
+
+        full_cols = []
+        for lo, hi in solid:
+            first = int(math.ceil(lo / px - EPS))
+            last = int(math.floor((hi - tile_width) / px + EPS))
+            if last >= first:
+                full += last - first + 1
+                full_cols.append((first, last))
+        touched_cols = _union((int(math.floor((lo - tile_width) / px + EPS)) + 1,
+                               int(math.ceil(hi / px - EPS)) - 1) for lo, hi in touched)
+        cut_cols = []
+        for first, last in touched_cols:
+            for a, b in full_cols:
+                if first <= last and a <= last and b >= first:
+                    cut_cols.extend(range(first, a))
+                    first = b + 1
+            cut_cols.extend(range(first, last + 1))
+
+        for col in cut_cols:
+            x0 = col * px
+            x1 = x0 + tile_width
+            area = 0.0
+            u_lo = v_lo = float("inf")
+            u_hi = v_hi = float("-inf")
+            for pairs in bands:
+                for ya, yb, xl_a, xl_b, xr_a, xr_b in pairs:
+                    lo, hi = max(x0, min(xl_a, xl_b)), min(x1, max(xr_a, xr_b))
+                    if hi <= lo:
+                        continue
+                    area += _span_area(ya, yb, xl_a, xl_b, xr_a, xr_b, x0, x1)
+                    u_lo, u_hi = min(u_lo, lo), max(u_hi, hi)
+                    v_lo, v_hi = min(v_lo, ya), max(v_hi, yb)
+            if area <= EPS:
+                continue
+            cut += 1
+            cut_area += area
+            if keep_pieces:
+                pieces.append(CutPiece(row, col, area, u_hi - u_lo, v_hi - v_lo))
+    return TileLayout(full, cut, cut_area, pieces)
+
+
+def polygon_area(loops):
+    """Area inside the polygon, holes removed (loops must not overlap)."""
+    areas = []
+    for loop in loops:
+        a = 0.0
+        for i, p in enumerate(loop):
+            q = loop[(i + 1) % len(loop)]
+            a += p[0] * q[1] - q[0] * p[1]
+        areas.append(abs(a) * 0.5)
+    return areas[0] - sum(areas[1:]) if areas else 0.0
+
+
+
+def clip_loop(loop, x0, x1, y0, y1):
+    """Part of a point loop inside the box x0..x1, y0..y1 (Sutherland-Hodgman).
+
+    A concave loop clipped into several pieces stays one loop joined by
+    zero-width edges along the box, which add no area under even-odd."""
+    def clip(points, inside, cross):
+        result = []
+        for i, b in enumerate(points):
+            a = points[i - 1]
+            if inside(b):
+                if not inside(a):
+                    result.append(cross(a, b))
+                result.append(b)
+            elif inside(a):
+                result.append(cross(a, b))
+        return result
+
+    def at_x(x):
+        return lambda a, b: (x, a[1] + (b[1] - a[1]) * (x - a[0]) / (b[0] - a[0]))
+
+    def at_y(y):
+        return lambda a, b: (a[0] + (b[0] - a[0]) * (y - a[1]) / (b[1] - a[1]), y)
+
+    points = [(p[0], p[1]) for p in loop]
+    for inside, cross in ((lambda p: p[0] >= x0, at_x(x0)), (lambda p: p[0] <= x1, at_x(x1)),
+                          (lambda p: p[1] >= y0, at_y(y0)), (lambda p: p[1] <= y1, at_y(y1))):
+        if not points:
+            break
+        points = clip(points, inside, cross)
+    return points
+
+# rotation in degrees; offset (along, across) the tile grid from the base origin
+LayoutOption = namedtuple("LayoutOption", ["rotation", "offset", "full", "cut", "slivers", "cut_area"])
+
+
+def count_slivers(pieces, min_size):
+    """Cut pieces narrower than min_size in either direction."""
+    return sum(1 for p in pieces if p.width < min_size or p.height < min_size)
+
+
+def optimise_setting_out(loops, tile_width, tile_height, joint=0.0, rotations=(0.0, 45.0, 90.0),
+                         steps=8, min_size=None, base_origin=(0.0, 0.0), keep=3):
+    """Best setting-out positions: fewest slivers, then fewest cuts.
+
+    The origin is moved over a steps x steps grid spanning one tile pitch
+    along and across the rows, for every rotation; other positions only
+    repeat the same layout shifted by whole tiles. Square tiles skip
+    rotations a quarter turn apart, which give the same layouts. min_size
+    defaults to a quarter of the smaller tile side. Returns the keep best
+    LayoutOptions."""
+    if min_size is None:
+        min_size = min(tile_width, tile_height) * 0.25
+    if abs(tile_width - tile_height) < EPS:
+        rotations = sorted(set(r % 90.0 for r in rotations))
+    px, py = tile_width + joint, tile_height + joint
+    options = []
+    for rotation in rotations:
+        c, s = math.cos(math.radians(rotation)), math.sin(math.radians(rotation))
+        for i in range(steps):
+            for j in range(steps):
+                du, dv = px * i / steps, py * j / steps
+                origin = (base_origin[0] + du * c - dv * s, base_origin[1] + du * s + dv * c)
+                layout = layout_tiles(loops, tile_width, tile_height, joint, rotation, origin)
+                options.append(LayoutOption(rotation, (du, dv), layout.full, layout.cut,
+                                            count_slivers(layout.pieces, min_size), layout.cut_area))
+    options.sort(key=lambda o: (o.slivers, o.cut, -o.full, o.rotation, o.offset))
+    return options[:keep]
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Reference-string helpers shared by the Dimension+ tools."""
+from Autodesk.Revit.DB import (BuiltInParameter, Dimension, DimensionStyleType, DimensionType,
+                               FamilyInstanceReferenceType, FilteredElementCollector, Line, Plane, ReferenceArray,
+                               SketchPlane, XYZ)
+
+from Geometry._cluster import dedupe_references
+from Snippets._facecache import faces_along
+from Snippets._shared import get_shared, doc_key
+
+LINE_OVERSHOOT = 2.0  # ft beyond the outermost reference
+ELEVATION_DIGITS = 6  # sketch planes closer than 1e-6 ft are the same plane
+
+
+def wall_direction(wall):
+    """Unit direction of a straight wall, or None."""
+    loc = wall.Location
+    if hasattr(loc, 'Curve') and isinstance(loc.Curve, Line):
+        return loc.Curve.Direction.Normalize()
+    return None
+
+
+def plan_normal(direction):
+    """Plan vector perpendicular to direction."""
+    return XYZ(-direction.Y, direction.X, 0).Normalize()
+
+
+def collect_refs(doc, sources, axis, tolerance):
+    """Deduplicated (coord, reference, point) along axis, sorted by coord.
+
+    sources is a list of (element, face_dir) pairs: the faces of element
+    parallel to face_dir are projected onto axis."""
+    ref_data = []
+    for element, face_dir in sources:
+        for face in faces_along(doc, element, face_dir):
+            ref_data.append((face.point.DotProduct(axis), face.reference, face.point))
+    return dedupe_references(ref_data, tolerance)
+
+
+def to_reference_array(ref_data):
+    ref_array = ReferenceArray()
+    for item in ref_data:
+        ref_array.Append(item[1])
+    return ref_array
+
+
+def string_line(lo, hi, axis, through):
+    """Dimension line along axis from lo to hi (coords on axis), through a point."""
+    base = through.DotProduct(axis)
+    pt1 = through + axis * (lo - LINE_OVERSHOOT - base)
+    pt2 = through + axis * (hi + LINE_OVERSHOOT - base)
+    return Line.CreateBound(pt1, pt2)
+
+
+WIDTH_PARAMS = (BuiltInParameter.FAMILY_WIDTH_PARAM, BuiltInParameter.DOOR_WIDTH,
+                BuiltInParameter.WINDOW_WIDTH)
+
+
+def insert_width(insert):
+    """Opening width of a door or window from its instance or type parameters, or None."""
+    for element in (insert, insert.Symbol):
+        for bip in WIDTH_PARAMS:
+            param = element.get_Parameter(bip)
+            if param is not None and param.HasValue and param.AsDouble() > 0:
+                return param.AsDouble()
+    return None
+
+
+def insert_named_refs(insert, axis, kinds=("Left", "Right")):
+    """(coord, reference, point) for an insert's named family references.
+
+    kinds are FamilyInstanceReferenceType names ("Left", "Right",
+    "CenterLeftRight"). Positions are taken from the instance origin and
+    half the width parameter along its hand orientation, so swing and
+    frame geometry and skewed hosts do not shift them; coordinates on axis
+    are only used for ordering and merging. Returns an empty list when the
+    family does not define the references or has no width parameter."""
+    width = insert_width(insert)
+    if width is None:
+        return []
+    origin = insert.GetTransform().Origin
+    # Right lies along the instance's hand orientation
+    hand = insert.HandOrientation.Normalize()
+    offsets = {"Left": -width / 2, "Right": width / 2, "CenterLeftRight": 0.0}
+
+    ref_data = []
+    for kind in kinds:
+        refs = insert.GetReferences(getattr(FamilyInstanceReferenceType, kind))
+        if not refs or refs.Count == 0:
+            return []
+        point = origin + hand * offsets[kind]
+        ref_data.append((point.DotProduct(axis), refs[0], point))
+    return ref_data
+
+
+# ╔═╗╦╔═╔═╗╔╦╗╔═╗╦ ╦  ╔═╗╦  ╔═╗╔╗╔╔═╗╔═╗
+# ╚═╗╠╩╗║╣  ║ ║  ╠═╣  ╠═╝║  ╠═╣║║║║╣ ╚═╗
+# ╚═╝╩ ╩╚═╝ ╩ ╚═╝╩ ╩  ╩  ╩═╝╩ ╩╝╚╝╚═╝╚═╝ SKETCH PLANES
+#==================================================
+def horizontal_elevation(sketch_plane):
+    """Rounded elevation of a horizontal sketch plane, or None."""
+    plane = sketch_plane.GetPlane()
+    if not plane.Normal.IsAlmostEqualTo(XYZ.BasisZ):
+        return None
+    return round(plane.Origin.Z, ELEVATION_DIGITS)
+
+
+def _elevation_map(doc):
+    """elevation -> sketch plane id, scanned once per document."""
+    maps = get_shared("SKETCH_PLANES", dict)
+    key = doc_key(doc)
+    if key not in maps:
+        elevations = {}
+        for sp in FilteredElementCollector(doc).OfClass(SketchPlane):
+            z = horizontal_elevation(sp)
+            if z is not None:
+                elevations.setdefault(z, sp.Id)
+        maps[key] = elevations
+    return maps[key]
+
+
+def is_loose_sketch_plane(sketch_plane):
+    """True for an unnamed horizontal sketch plane, as Dimension+ creates.
+
+    Level and reference plane work planes carry the name of their host,
+    so they never match."""
+    return not sketch_plane.Name and horizontal_elevation(sketch_plane) is not None
+
+
+def get_sketch_plane(doc, z):
+    """Horizontal sketch plane at elevation z, reusing an existing one.
+
+    Must run inside a transaction; a new plane is only created when the
+    document has none at that elevation. Planes are shared by elevation
+    rather than per view, since any view cut at that height can use the
+    same plane. A cached id is checked before reuse: a rolled back or
+    purged plane leaves it pointing at nothing, or at a reused id."""
+    z = round(z, ELEVATION_DIGITS)
+    elevations = _elevation_map(doc)
+    sp_id = elevations.get(z)
+    sp = doc.GetElement(sp_id) if sp_id else None
+    if not isinstance(sp, SketchPlane) or horizontal_elevation(sp) != z:
+        sp = SketchPlane.Create(doc, Plane.CreateByNormalAndOrigin(XYZ.BasisZ, XYZ(0, 0, z)))
+        elevations[z] = sp.Id
+    return sp
+
+
+def set_view_sketch_plane(doc, view, z):
+    """Point view at a horizontal work plane at elevation z (inside a transaction)."""
+    current = view.SketchPlane
+    if current is not None and horizontal_elevation(current) == round(z, ELEVATION_DIGITS):
+        return current
+    sp = get_sketch_plane(doc, z)
+    view.SketchPlane = sp
+    return sp
+
+
+# ╔╦╗╦╔╦╗╔═╗╔╗╔╔═╗╦╔═╗╔╗╔  ╔╦╗╦ ╦╔═╗╔═╗
+#  ║║║║║║║╣ ║║║╚═╗║║ ║║║║   ║ ╚╦╝╠═╝║╣
+# ═╩╝╩╩ ╩╚═╝╝╚╝╚═╝╩╚═╝╝╚╝   ╩  ╩ ╩  ╚═╝ DIMENSION TYPE
+#==================================================
+def _is_linear(dim_type):
+    return isinstance(dim_type, DimensionType) and \
+        getattr(dim_type, "StyleType", None) == DimensionStyleType.Linear
+
+
+def remember_dimension_type(doc, dim_type):
+    """Record dim_type as the default linear type for later runs and tools."""
+    get_shared("DIM_TYPE", dict)[doc_key(doc)] = dim_type.Id
+
+
+def get_dimension_type(doc):
+    """Linear dimension type to use, or None.
+
+    Prefers the type the Dimension+ tools last used in this document, then
+    the type of the newest dimension (a single pass over element ids), then
+    the first linear dimension type."""
+    remembered = get_shared("DIM_TYPE", dict)
+    type_id = remembered.get(doc_key(doc))
+    dim_type = doc.GetElement(type_id) if type_id else None
+    if _is_linear(dim_type):
+        return dim_type
+
+    newest = None
+    iterator = FilteredElementCollector(doc).OfClass(Dimension).GetElementIdIterator()
+    while iterator.MoveNext():
+        eid = iterator.Current
+        if newest is None or eid.IntegerValue > newest.IntegerValue:
+            newest = eid
+    dim_type = doc.GetElement(doc.GetElement(newest).GetTypeId()) if newest else None
+
+    if not _is_linear(dim_type):
+        dim_type = None
+        for dt in FilteredElementCollector(doc).OfClass(DimensionType):
+            if _is_linear(dt):
+                dim_type = dt
+                break
+    if dim_type is not None:
+        remember_dimension_type(doc, dim_type)
+    return dim_type
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Face-reference cache shared by the Dimension+ tools.
+
+Every planar face of an element is stored once as a FaceRecord holding
+its normal, planar offset (normal . origin), centre point and Reference.
+Entries are evicted least-recently-used and dropped as soon as the
+doc-changed hook reports the element as modified or deleted."""
+from collections import namedtuple
+
+from Autodesk.Revit.DB import (ElementId, HostObjectUtils, Options, PlanarFace,
+                               ShellLayerType, Solid, UV, ViewDetailLevel, Wall)
+
+from Geometry._cache import LRUCache
+from Snippets._shared import get_shared, doc_key
+
+CACHE_CAPACITY = 4000  # elements per document
+
+FaceRecord = namedtuple("FaceRecord", ["normal", "offset", "point", "reference"])
+
+_options = Options()
+_options.ComputeReferences = True
+_options.IncludeNonVisibleObjects = False
+_options.DetailLevel = ViewDetailLevel.Fine
+
+
+def _caches():
+    return get_shared("FACE_CACHE", dict)
+
+
+def get_doc_cache(doc):
+    caches = _caches()
+    key = doc_key(doc)
+    if key not in caches:
+        caches[key] = LRUCache(CACHE_CAPACITY)
+    return caches[key]
+
+
+def extract_face_records(element):
+    """Walk the fine solid geometry of element and return its FaceRecords."""
+    records = []
+    geo = element.get_Geometry(_options)
+    for obj in geo or []:
+        solid = obj if isinstance(obj, Solid) else None
+        if not solid:
+            continue
+        for face in solid.Faces:
+            try:
+                ref = face.Reference
+                if ref is None or ref.ElementId.IntegerValue <= 0:
+                    continue
+                normal = face.ComputeNormal(UV(0.5, 0.5)).Normalize()
+                point = face.Evaluate(UV(0.5, 0.5))
+                records.append(FaceRecord(normal, normal.DotProduct(point), point, ref))
+            except:
+                continue
+    return records
+
+
+def _planar_record(face, ref):
+    normal = face.FaceNormal.Normalize()
+    point = face.Evaluate(UV(0.5, 0.5))
+    return FaceRecord(normal, normal.DotProduct(point), point, ref)
+
+
+def _has_simple_profile(wall):
+    if wall.IsStackedWall:
+        return False
+    sketch_id = getattr(wall, "SketchId", None)
+    if sketch_id is not None and sketch_id != ElementId.InvalidElementId:
+        return False
+    curve = getattr(wall.Location, "Curve", None)
+    return curve is not None and curve.GetType().Name == "Line"
+
+
+def _free_end_count(wall):
+    loc = wall.Location
+    free = 0
+    for end in (0, 1):
+        try:
+            if loc.get_ElementsAtJoin(end).Size == 0:
+                free += 1
+        except:
+            free += 1
+    return free
+
+
+def extract_wall_side_records(wall):
+    """FaceRecords of a straight wall from its host side faces and end caps.
+
+    Side faces come from HostObjectUtils.GetSideFaces; end caps are the
+    faces adjoining the exterior side face along its vertical edges.
+    Returns None when the wall has a complex profile or the expected faces
+    cannot be found, in which case the caller walks the full solid."""
+    if not _has_simple_profile(wall):
+        return None
+    records = []
+    side_faces = []
+    for shell in (ShellLayerType.Exterior, ShellLayerType.Interior):
+        refs = HostObjectUtils.GetSideFaces(wall, shell)
+        if refs.Count != 1:
+            return None
+        face = wall.GetGeometryObjectFromReference(refs[0])
+        if not isinstance(face, PlanarFace):
+            return None
+        side_faces.append(face)
+        records.append(_planar_record(face, refs[0]))
+
+    direction = wall.Location.Curve.Direction
+    neg = direction.Negate()
+    seen = set()
+    for loop in side_faces[0].EdgeLoops:
+        for edge in loop:
+            for i in (0, 1):
+                cap = edge.GetFace(i)
+                if not isinstance(cap, PlanarFace) or cap.Reference is None:
+                    continue
+                normal = cap.FaceNormal
+                if not (normal.IsAlmostEqualTo(direction) or normal.IsAlmostEqualTo(neg)):
+                    continue
+                stable = cap.Reference.ConvertToStableRepresentation(wall.Document)
+                if stable in seen:
+                    continue
+                seen.add(stable)
+                records.append(_planar_record(cap, cap.Reference))
+    if len(seen) < _free_end_count(wall):
+        return None
+    return records
+
+
+def get_face_records(doc, element):
+    """Cached FaceRecords of element.
+
+    Straight walls use the side-face path; everything else, and walls the
+    side-face path rejects, fall back to the full solid walk."""
+    cache = get_doc_cache(doc)
+    key = element.Id.IntegerValue
+    records = cache.get(key)
+    if records is None:
+        if isinstance(element, Wall):
+            try:
+                records = extract_wall_side_records(element)
+            except:
+                records = None
+        if records is None:
+            records = extract_face_records(element)
+        cache.put(key, records)
+    return records
+
+
+def faces_along(doc, element, direction):
+    """FaceRecords of element whose normal is parallel to direction."""
+    neg = direction.Negate()
+    return [r for r in get_face_records(doc, element)
+            if r.normal.IsAlmostEqualTo(direction) or r.normal.IsAlmostEqualTo(neg)]
+
+
+def on_document_changed(args):
+    """Drop cached faces of modified and deleted elements."""
+    cache = _caches().get(doc_key(args.GetDocument()))
+    if not cache:
+        return
+    ids = list(args.GetModifiedElementIds()) + list(args.GetDeletedElementIds())
+    cache.invalidate([eid.IntegerValue for eid in ids])
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Grid index shared by the Dimension+ tools."""
+from Autodesk.Revit.DB import (BuiltInCategory, ElementId, FilteredElementCollector, Grid, Line,
+                               Reference, XYZ)
+
+from Geometry._cluster import angle_difference, direction_angle, group_by_direction
+from Geometry._spatial import NearestIndex
+from Snippets._shared import get_shared, doc_key
+
+ANGLE_TOLERANCE = 0.5  # degrees
+
+
+class GridFamily(object):
+    """Parallel grids sorted by their coordinate on the family's normal."""
+
+    def __init__(self, angle, normal, grids):
+        self.angle = angle
+        self.normal = normal
+        self.index = NearestIndex([(g.Curve.GetEndPoint(0).DotProduct(normal), g.Id.IntegerValue)
+                                   for g in grids])
+
+
+class GridIndex(object):
+    def __init__(self, grids):
+        grids = [g for g in grids if isinstance(g, Grid) and isinstance(g.Curve, Line)]
+        self.grid_ids = set(g.Id.IntegerValue for g in grids)
+        self.families = []
+        for angle, members in group_by_direction(grids, lambda g: (g.Curve.Direction.X, g.Curve.Direction.Y),
+                                                 ANGLE_TOLERANCE):
+            d = members[0].Curve.Direction
+            normal = XYZ(-d.Y, d.X, 0).Normalize()
+            self.families.append(GridFamily(angle, normal, members))
+
+    def family_for(self, direction):
+        """Grid family parallel to a plan direction, or None."""
+        angle = direction_angle(direction.X, direction.Y)
+        for family in self.families:
+            if angle_difference(family.angle, angle) <= ANGLE_TOLERANCE:
+                return family
+        return None
+
+
+def get_grid_index(doc):
+    """Index of the document's straight grids, built once per document."""
+    indexes = get_shared("GRID_INDEX", dict)
+    key = doc_key(doc)
+    if key not in indexes:
+        # OfClass(Grid) leaves out multi-segment grids, which have no single Curve
+        grids = FilteredElementCollector(doc).OfClass(Grid)
+        indexes[key] = GridIndex(grids)
+    return indexes[key]
+
+
+def nearest_grid(doc, point, direction, max_distance=None):
+    """(grid, Reference) of the grid parallel to direction nearest point, or None."""
+    family = get_grid_index(doc).family_for(direction)
+    if family is None:
+        return None
+    hit = family.index.nearest(point.DotProduct(family.normal), max_distance)
+    if hit is None:
+        return None
+    grid = doc.GetElement(ElementId(hit[1]))
+    return grid, Reference(grid)
+
+
+def on_document_changed(args):
+    """Drop the grid index when grids are added, moved or deleted."""
+    indexes = get_shared("GRID_INDEX", dict)
+    key = doc_key(args.GetDocument())
+    index = indexes.get(key)
+    if index is None:
+        return
+    changed = list(args.GetModifiedElementIds()) + list(args.GetDeletedElementIds())
+    if any(eid.IntegerValue in index.grid_ids for eid in changed):
+        del indexes[key]
+        return
+    doc = args.GetDocument()
+    for eid in args.GetAddedElementIds():
+        el = doc.GetElement(eid)
+        if el is not None and el.Category is not None and \
+                el.Category.Id.IntegerValue == int(BuiltInCategory.OST_Grids):
+            del indexes[key]
+            return
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Lookup of grout voids placed by the Grouting tool.
+
+Each void records its host wall and the doors/windows it surrounds in the
+TTGroutHostId and TTGroutInsertIds shared parameters. Openings whose
+union is not a rectangle get one void per piece; pieces after the first
+append "#<part>" to the insert ids."""
+from Autodesk.Revit.DB import FamilyInstance, FilteredElementCollector
+
+GROUT_HOST_PARAM = "TTGroutHostId"
+GROUT_INSERTS_PARAM = "TTGroutInsertIds"
+
+
+def grout_key(host_id, insert_ids, part=0):
+    """Index key of a void: (host id integer, sorted insert id integers, part)."""
+    return (host_id, tuple(sorted(insert_ids)), part)
+
+
+def tag_grout(void, host_id, insert_ids, part=0):
+    """Record host, insert ids and part index on a void.
+
+    Returns False when the shared parameters are not bound to its category."""
+    host_param = void.LookupParameter(GROUT_HOST_PARAM)
+    inserts_param = void.LookupParameter(GROUT_INSERTS_PARAM)
+    if not host_param or not inserts_param:
+        return False
+    host_param.Set(str(host_id))
+    text = ",".join(str(i) for i in sorted(insert_ids))
+    inserts_param.Set("{}#{}".format(text, part) if part else text)
+    return True
+
+
+def read_grout(void):
+    """grout_key recorded on void, or None when untagged."""
+    host_param = void.LookupParameter(GROUT_HOST_PARAM)
+    inserts_param = void.LookupParameter(GROUT_INSERTS_PARAM)
+    if not host_param or not inserts_param or not host_param.AsString() or not inserts_param.AsString():
+        return None
+    ids, _, part = inserts_param.AsString().partition("#")
+    try:
+        return grout_key(int(host_param.AsString()), [int(i) for i in ids.split(",")], int(part or 0))
+    except ValueError:
+        return None
+
+
+def grout_voids_by_key(doc, family):
+    """({grout_key: void}, [duplicate voids]) for tagged instances of family.
+
+    A second void carrying a key already seen is returned as a duplicate
+    so it can be cleaned up."""
+    index, duplicates = {}, []
+    for inst in FilteredElementCollector(doc).OfClass(FamilyInstance).OfCategoryId(family.FamilyCategory.Id):
+        if inst.Symbol.Family.Id != family.Id:
+            continue
+        key = read_grout(inst)
+        if key is None:
+            continue
+        if key in index:
+            duplicates.append(inst)
+        else:
+            index[key] = inst
+    return index, duplicates
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""Room boundary helpers shared by the room finish tools."""
+from Autodesk.Revit.DB import (Arc, BuiltInCategory, CurveLoop, FilteredElementCollector, Level,
+                               Line, SpatialElementBoundaryOptions,
+                               SpatialElementGeometryCalculator, XYZ)
+from Autodesk.Revit.DB.Architecture import Room
+from Autodesk.Revit.UI.Selection import ISelectionFilter, ObjectType
+
+from Geometry import _boundary
+from Geometry._cache import LRUCache
+from Snippets._shared import get_shared, doc_key
+
+CACHE_CAPACITY = 5000  # rooms per document
+BOX_MARGIN = 1.0       # ft: elements this close to a room's box may change its boundary
+
+# Elements of these categories can bound a room wherever they are added or moved
+ROOM_BOUNDING_CATEGORIES = set(int(c) for c in (BuiltInCategory.OST_Walls, BuiltInCategory.OST_RoomSeparationLines,
+                                                BuiltInCategory.OST_Columns, BuiltInCategory.OST_StructuralColumns))
+
+
+class RoomSelectionFilter(ISelectionFilter):
+    def AllowElement(self, element):
+        return isinstance(element, Room)
+    def AllowReference(self, ref, point):
+        return True
+
+
+PICK_ROOMS = "Pick Rooms"
+ROOMS_ON_LEVEL = "Rooms on Level"
+
+
+def select_rooms(doc, uidoc, message="Select rooms:", extra_modes=()):
+    """Placed rooms from the pre-selection, a multi-pick or a whole level.
+
+    Without a pre-selection the user chooses between picking rooms, a
+    level, or any of extra_modes. Returns (rooms, mode); mode is None for
+    a pre-selection and rooms is empty for an extra mode."""
+    from pyrevit import forms, script  # UI only; keeps the doc-changed hook light
+    rooms = [doc.GetElement(eid) for eid in uidoc.Selection.GetElementIds()]
+    rooms = [r for r in rooms if isinstance(r, Room)]
+    mode = None
+    if not rooms:
+        mode = forms.CommandSwitchWindow.show([PICK_ROOMS, ROOMS_ON_LEVEL] + list(extra_modes),
+                                              message=message)
+        if not mode:
+            script.exit()
+        if mode == PICK_ROOMS:
+            try:
+                room_refs = uidoc.Selection.PickObjects(ObjectType.Element, RoomSelectionFilter(), "Select rooms")
+            except:
+                script.exit()
+            rooms = [doc.GetElement(r.ElementId) for r in room_refs]
+        elif mode == ROOMS_ON_LEVEL:
+            level_map = {lvl.Name: lvl for lvl in FilteredElementCollector(doc).OfClass(Level)}
+            level_name = forms.SelectFromList.show(sorted(level_map.keys()), button_name="Select Level")
+            if not level_name:
+                script.exit()
+            level_id = level_map[level_name].Id
+            rooms = [r for r in FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Rooms)
+                     if isinstance(r, Room) and r.LevelId == level_id]
+    return [r for r in rooms if r and r.Location and r.Area > 0], mode
+
+
+def _pt(xyz):
+    return (xyz.X, xyz.Y, xyz.Z)
+
+
+def _xyz(pt):
+    return XYZ(pt[0], pt[1], pt[2])
+
+
+def curve_to_segment(curve):
+    start, end = _pt(curve.GetEndPoint(0)), _pt(curve.GetEndPoint(1))
+    if isinstance(curve, Line):
+        return _boundary.line(start, end, curve)
+    if isinstance(curve, Arc):
+        return _boundary.arc(start, end, _pt(curve.Center), curve.Radius,
+                             _pt(curve.Evaluate(0.5, True)), curve)
+    return _boundary.other(start, end, curve)
+
+
+def segment_to_curve(seg):
+    if seg.source is not None:
+        return seg.source
+    if seg.kind == "arc":
+        return Arc.Create(_xyz(seg.start), _xyz(seg.end), _xyz(seg.mid))
+    return Line.CreateBound(_xyz(seg.start), _xyz(seg.end))
+
+
+def boundary_segment_loops(boundaries, tolerance=_boundary.DEFAULT_TOLERANCE):
+    """Simplified Segment loops of GetBoundarySegments output, outer loop first."""
+    loops = []
+    for loop in boundaries:
+        segments = [curve_to_segment(seg.GetCurve()) for seg in loop]
+        segments = _boundary.simplify_loop(segments, tolerance)
+        if len(segments) >= 2:
+            loops.append(segments)
+    return _boundary.order_loops(loops)
+
+
+def segments_to_curve_loop(segments):
+    curve_loop = CurveLoop()
+    for seg in segments:
+        curve_loop.Append(segment_to_curve(seg))
+    return curve_loop
+
+
+def room_segment_loops(room, options, tolerance=_boundary.DEFAULT_TOLERANCE):
+    """Simplified Segment loops of a room (outer first, then holes)."""
+    boundaries = room.GetBoundarySegments(options)
+    if not boundaries:
+        return []
+    return boundary_segment_loops(boundaries, tolerance)
+
+
+def room_curve_loops(room, options, tolerance=_boundary.DEFAULT_TOLERANCE):
+    """One CurveLoop per boundary loop (outer first, then holes), simplified."""
+    return [segments_to_curve_loop(lp) for lp in room_segment_loops(room, options, tolerance)]
+
+
+# ╔═╗╔═╗╦ ╦╦═╗╔═╗╔═╗  ╔╦╗╔═╗╔═╗
+# ╚═╗║ ║║ ║╠╦╝║  ║╣    ║ ╠═╣║ ╦
+# ╚═╝╚═╝╚═╝╩╚═╚═╝╚═╝   ╩ ╩ ╩╚═╝ SOURCE TAG
+#==================================================
+# Shared parameters from assets/Share Parameter/TT 1.0.txt ("Floor to Room" group)
+SOURCE_ROOM_PARAM = "TTSourceRoomId"
+BOUNDARY_HASH_PARAM = "TTBoundaryHash"
+
+
+def tag_source(element, room, boundary_hash):
+    """Record the source room and boundary hash on a generated element.
+
+    Returns False when the shared parameters are not bound to its category."""
+    room_param = element.LookupParameter(SOURCE_ROOM_PARAM)
+    hash_param = element.LookupParameter(BOUNDARY_HASH_PARAM)
+    if not room_param or not hash_param:
+        return False
+    room_param.Set(str(room.Id.IntegerValue))
+    hash_param.Set(boundary_hash)
+    return True
+
+
+def read_source(element):
+    """(room id integer, boundary hash) recorded on element, or None."""
+    room_param = element.LookupParameter(SOURCE_ROOM_PARAM)
+    hash_param = element.LookupParameter(BOUNDARY_HASH_PARAM)
+    if not room_param or not room_param.HasValue or not room_param.AsString():
+        return None
+    try:
+        room_id = int(room_param.AsString())
+    except ValueError:
+        return None
+    return room_id, hash_param.AsString() if hash_param else None
+
+
+def tagged_elements_by_room(elements):
+    """{room id integer: [(element, boundary hash), ...]} for tagged elements."""
+    grouped = {}
+    for el in elements:
+        source = read_source(el)
+        if source:
+            grouped.setdefault(source[0], []).append((el, source[1]))
+    return grouped
+
+
+# ╦═╗╔═╗╔═╗╔╦╗  ╔═╗╔═╗╔═╗╔╦╗╔═╗╔╦╗╦═╗╦ ╦
+# ╠╦╝║ ║║ ║║║║  ║ ╦║╣ ║ ║║║║║╣  ║ ╠╦╝╚╦╝
+# ╩╚═╚═╝╚═╝╩ ╩  ╚═╝╚═╝╚═╝╩ ╩╚═╝ ╩ ╩╚═ ╩  ROOM GEOMETRY
+#==================================================
+class RoomGeometry(object):
+    """Boundary and solid data of one room.
+
+    loops         simplified Segment loops, outer first
+    segments      [(curve, bounding element id integer)] as returned by Revit
+    perimeter     length of the raw boundary (ft)
+    area          room area (sq ft)
+    extents       ((x, y, z) min, (x, y, z) max) of the room, or None
+    solid         room solid from the geometry calculator (on demand)
+    faces_by_element  {bounding element id integer: [room-side sub faces]} (on demand)"""
+
+    def __init__(self, room, loops, segments):
+        self.room_id = room.Id.IntegerValue
+        self.level_id = room.LevelId
+        self.loops = loops
+        self.segments = segments
+        self.perimeter = sum(curve.Length for curve, _ in segments)
+        self.area = room.Area
+        box = room.get_BoundingBox(None)
+        self.extents = ((box.Min.X, box.Min.Y, box.Min.Z), (box.Max.X, box.Max.Y, box.Max.Z)) if box else None
+        self.solid = None
+        self.faces_by_element = None
+
+    @property
+    def bounding_ids(self):
+        ids = set(eid for _, eid in self.segments if eid > 0)
+        if self.faces_by_element:
+            ids.update(self.faces_by_element)
+        return ids
+
+    def near(self, extents, margin=BOX_MARGIN):
+        """True when extents ((min), (max)) come within margin of the room, or either is unknown."""
+        if extents is None or self.extents is None:
+            return True
+        (a_lo, a_hi), (b_lo, b_hi) = self.extents, extents
+        return all(a_lo[i] - margin <= b_hi[i] and b_lo[i] - margin <= a_hi[i] for i in range(3))
+
+
+class RoomGeometryService(object):
+    """Room boundaries and solids for many rooms, cached per room.
+
+    One SpatialElementBoundaryOptions and one SpatialElementGeometryCalculator
+    are shared by every room. Entries are dropped when the room or any of
+    its bounding elements change, and when a wall, separation line or
+    column is added or moved near the room (see on_document_changed)."""
+
+    def __init__(self, doc, tolerance=_boundary.DEFAULT_TOLERANCE):
+        self.doc = doc
+        self.tolerance = tolerance
+        self.options = SpatialElementBoundaryOptions()
+        self.calculator = SpatialElementGeometryCalculator(doc, self.options)
+        self._cache = LRUCache(CACHE_CAPACITY, on_evict=lambda key, geometry: self._untrack(geometry))
+        self._dependents = {}  # bounding element id -> set(room ids)
+
+    def _track(self, geometry):
+        for eid in geometry.bounding_ids:
+            self._dependents.setdefault(eid, set()).add(geometry.room_id)
+
+    def _untrack(self, geometry):
+        for eid in geometry.bounding_ids:
+            rooms = self._dependents.get(eid)
+            if rooms is not None:
+                rooms.discard(geometry.room_id)
+                if not rooms:
+                    del self._dependents[eid]
+
+    def _drop(self, room_ids):
+        for room_id in room_ids:
+            geometry = self._cache.pop(room_id)
+            if geometry is not None:
+                self._untrack(geometry)
+
+    def get(self, room, with_solid=False):
+        """RoomGeometry of room, computing the solid too when with_solid."""
+        key = room.Id.IntegerValue
+        geometry = self._cache.get(key)
+        if geometry is None:
+            boundaries = room.GetBoundarySegments(self.options) or []
+            segments = [(seg.GetCurve(), seg.ElementId.IntegerValue) for loop in boundaries for seg in loop]
+            geometry = RoomGeometry(room, boundary_segment_loops(boundaries, self.tolerance), segments)
+            self._cache.put(key, geometry)
+            self._track(geometry)
+        if with_solid and geometry.solid is None:
+            self._calculate_solid(room, geometry)
+        return geometry
+
+    def _calculate_solid(self, room, geometry):
+        results = self.calculator.CalculateSpatialElementGeometry(room)
+        solid = results.GetGeometry()
+        faces_by_element = {}
+        for face in solid.Faces:
+            for subface in results.GetBoundaryFaceInfo(face):
+                host_id = subface.SpatialBoundaryElement.HostElementId.IntegerValue
+                faces_by_element.setdefault(host_id, []).append(subface.GetSubface())
+        geometry.solid = solid
+        geometry.faces_by_element = faces_by_element
+        self._track(geometry)
+
+    def get_all(self, rooms, with_solid=False):
+        """({room id integer: RoomGeometry}, {room id integer: error message}) for rooms, in one pass."""
+        result, errors = {}, {}
+        for room in rooms:
+            try:
+                result[room.Id.IntegerValue] = self.get(room, with_solid)
+            except Exception as e:
+                errors[room.Id.IntegerValue] = str(e)
+        return result, errors
+
+    def invalidate(self, element_ids):
+        rooms = set()
+        for eid in element_ids:
+            rooms.add(eid)
+            rooms.update(self._dependents.pop(eid, ()))
+        self._drop(rooms)
+
+    def invalidate_near(self, boxes):
+        """Drop rooms near any of boxes (extents tuples, None for unknown)."""
+        self._drop([g.room_id for g in self._cache.values() if any(g.near(box) for box in boxes)])
+
+
+def get_room_geometry_service(doc):
+    """Shared RoomGeometryService of doc."""
+    services = get_shared("ROOM_GEOMETRY", dict)
+    key = doc_key(doc)
+    if key not in services:
+        services[key] = RoomGeometryService(doc)
+    return services[key]
+
+
+def on_document_changed(args):
+    """Drop cached room geometry touched by added, modified or deleted elements.
+
+    Modified and deleted rooms and bounding elements are dropped by id. A
+    wall, separation line or column that is added or moved may start to
+    bound rooms it did not bound before, so rooms near it are dropped too."""
+    doc = args.GetDocument()
+    service = get_shared("ROOM_GEOMETRY", dict).get(doc_key(doc))
+    if service is None:
+        return
+    modified = list(args.GetModifiedElementIds())
+    service.invalidate([eid.IntegerValue for eid in modified + list(args.GetDeletedElementIds())])
+    boxes = []
+    for eid in list(args.GetAddedElementIds()) + modified:
+        el = doc.GetElement(eid)
+        if el is None or el.Category is None or el.Category.Id.IntegerValue not in ROOM_BOUNDING_CATEGORIES:
+            continue
+        box = el.get_BoundingBox(None)
+        boxes.append(((box.Min.X, box.Min.Y, box.Min.Z), (box.Max.X, box.Max.Y, box.Max.Z)) if box else None)
+    if boxes:
+        service.invalidate_near(boxes)
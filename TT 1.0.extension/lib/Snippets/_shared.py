@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""Process-wide storage for caches that should outlive a single button click.
+
+pyRevit may run every command and hook in its own engine, so plain module
+globals are not shared between them. Values are parked on the AppDomain
+instead, which every engine in the Revit session can reach."""
+from System import AppDomain
+
+PREFIX = "TT10_"
+
+
+def get_shared(name, factory):
+    """Return the shared object stored under name, creating it on first use."""
+    domain = AppDomain.CurrentDomain
+    key = PREFIX + name
+    value = domain.GetData(key)
+    if value is None:
+        value = factory()
+        domain.SetData(key, value)
+    return value
+
+
+def doc_key(doc):
+    """Stable per-session key for a Document."""
+    return doc.GetHashCode()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Revit side of the Tiles Count tool: surfaces to plain polygons."""
+import math
+from collections import namedtuple
+
+from Autodesk.Revit.DB import Floor, HostObjectUtils, ShellLayerType, Wall
+from Autodesk.Revit.UI.Selection import ISelectionFilter
+
+from Geometry._cache import LRUCache
+from Geometry._framing import rect_union
+from Geometry._packing import reuse_cut_pieces
+from Geometry._tiles import clip_loop, layout_tiles, polygon_area
+from Snippets._rooms import segment_to_curve
+from Snippets._shared import get_shared, doc_key
+
+CACHE_CAPACITY = 20000  # surfaces per document
+
+# area in sq ft; cut_tiles: whole tiles cut for the pieces after offcut reuse
+SurfaceCount = namedtuple("SurfaceCount", ["area", "full", "cut", "cut_tiles", "offcut_area"])
+
+
+class FloorSelectionFilter(ISelectionFilter):
+    def AllowElement(self, element):
+        return isinstance(element, Floor)
+    def AllowReference(self, ref, point):
+        return True
+
+
+class WallSelectionFilter(ISelectionFilter):
+    def AllowElement(self, element):
+        return isinstance(element, Wall)
+    def AllowReference(self, ref, point):
+        return True
+
+
+def plan_xy(pt):
+    return (pt.X, pt.Y)
+
+
+def curve_loop_points(curve_loop, to_2d):
+    """One closed point loop through a CurveLoop, arcs tessellated."""
+    points = []
+    for curve in curve_loop:
+        pts = curve.Tessellate()
+        points.extend(to_2d(p) for p in list(pts)[:-1])
+    return points
+
+
+def face_polygon(face, to_2d):
+    """Edge loops of a planar face as a polygon for Geometry._tiles."""
+    loops = [curve_loop_points(cl, to_2d) for cl in face.GetEdgesAsCurveLoops()]
+    return [lp for lp in loops if len(lp) >= 3]
+
+
+def segment_loops_polygon(loops):
+    """Polygon of simplified Segment loops (e.g. room boundaries)."""
+    polygon = []
+    for loop in loops:
+        points = []
+        for seg in loop:
+            points.extend(plan_xy(p) for p in list(segment_to_curve(seg).Tessellate())[:-1])
+        if len(points) >= 3:
+            polygon.append(points)
+    return polygon
+
+
+def floor_top_polygons(floor):
+    """Plan polygon of every top face of floor."""
+    polygons = []
+    for ref in HostObjectUtils.GetTopFaces(floor):
+        face = floor.GetGeometryObjectFromReference(ref)
+        if face is None:
+            continue
+        polygon = face_polygon(face, plan_xy)
+        if polygon:
+            polygons.append(polygon)
+    return polygons
+
+
+def wall_local_uw(frame):
+    """Point to (along, up) in a wall frame from Geometry._framing."""
+    ox, oy, oz = frame.origin
+    ux, uy, _ = frame.u
+
+    def to_uw(pt):
+        return ((pt.X - ox) * ux + (pt.Y - oy) * uy, pt.Z - oz)
+    return to_uw
+
+
+def _within(loop, rects, tolerance):
+    return any(all(u0 - tolerance <= p[0] <= u1 + tolerance and w0 - tolerance <= p[1] <= w1 + tolerance
+                   for p in loop) for u0, u1, w0, w1 in rects)
+
+
+def wall_side_polygons(wall, frame, interior=True, openings=(), tolerance=1.0 / 304.8):
+    """Wall-local polygons of a wall's interior or exterior side faces.
+
+    openings are (u0, u1, w0, w1) rectangles in the same frame, e.g. from
+    the doors and windows hosted in the wall. The face keeps its real
+    outline, so edited profiles, attached tops, wall openings and void
+    cuts stay untiled. The openings are unioned and clipped to that
+    outline before becoming holes: a door already notched into the outline
+    only removes the frame strips the face still has, and face holes that
+    an opening covers are replaced by it rather than subtracted twice."""
+    layer = ShellLayerType.Interior if interior else ShellLayerType.Exterior
+    to_uw = wall_local_uw(frame)
+    polygons = []
+    for ref in HostObjectUtils.GetSideFaces(wall, layer):
+        face = wall.GetGeometryObjectFromReference(ref)
+        loops = face_polygon(face, to_uw) if face is not None else []
+        if not loops:
+            continue
+        loops.sort(key=lambda lp: polygon_area([lp]), reverse=True)
+        outline, inner = loops[0], loops[1:]
+        rects = rect_union([r for r in openings if r[1] > r[0] and r[3] > r[2]], tolerance)
+        holes = [clip_loop(outline, *r) for r in rects]
+        holes = [h for h in holes if len(h) >= 3 and polygon_area([h]) > tolerance * tolerance]
+        holes.extend(lp for lp in inner if not _within(lp, rects, tolerance))
+        polygons.append([outline] + holes)
+    return polygons
+
+
+def parse_tile_size(text):
+    """'600x300' or '600' (square) in mm to (width, height) in feet."""
+    parts = text.lower().replace("*", "x").split("x")
+    if len(parts) == 1:
+        parts = parts * 2
+    width, height = [float(p) / 304.8 for p in parts]
+    if width <= 0 or height <= 0:
+        raise ValueError("Tile size must be positive.")
+    return width, height
+
+
+def setting_out_corner(polygon):
+    """Default setting-out origin: the corner of the polygon's bounding box."""
+    return (min(p[0] for lp in polygon for p in lp), min(p[1] for lp in polygon for p in lp))
+
+
+def setting_out_origin(polygon, rotation, offset=(0.0, 0.0)):
+    """Setting-out origin offset from the bounding-box corner along and across
+    the rotated tile rows, as reported by optimise_setting_out."""
+    corner = setting_out_corner(polygon)
+    c, s = math.cos(math.radians(rotation)), math.sin(math.radians(rotation))
+    du, dv = offset
+    return (corner[0] + du * c - dv * s, corner[1] + du * s + dv * c)
+
+
+def count_surface(polygon, tile_width, tile_height, joint, rotation, allowance, origin=None, offset=(0.0, 0.0)):
+    """SurfaceCount of one surface, offcuts reused for the cut pieces.
+
+    Without an origin the tiles are set out from the bounding-box corner,
+    moved by offset along and across the tile rows."""
+    if origin is None:
+        origin = setting_out_origin(polygon, rotation, offset)
+    layout = layout_tiles(polygon, tile_width, tile_height, joint, rotation, origin)
+    reuse = reuse_cut_pieces(layout.pieces, tile_width, tile_height, allowance)
+    return SurfaceCount(polygon_area(polygon), layout.full, layout.cut, reuse.tiles, reuse.offcut_area)
+
+
+def get_takeoff_cache(doc):
+    """Shared {(element id integer, surface): (hash, SurfaceCount)} LRU cache of doc.
+
+    Entries are only reused while their geometry and tile settings hash
+    matches, so the cache needs no invalidation hook."""
+    caches = get_shared("TILE_TAKEOFF", dict)
+    key = doc_key(doc)
+    if key not in caches:
+        caches[key] = LRUCache(CACHE_CAPACITY)
+    return caches[key]
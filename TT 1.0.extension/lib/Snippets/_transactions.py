@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Batched transactions for tools that touch many elements in one run."""
+from Autodesk.Revit.DB import SubTransaction, Transaction, TransactionGroup, TransactionStatus
+
+
+def run_batched(doc, name, items, action, chunk_size=100):
+    """Apply action(item) to every item inside one TransactionGroup.
+
+    Items are committed in chunks of chunk_size, each item in its own
+    SubTransaction, so a failing item is rolled back on its own and the
+    rest of the chunk still commits. When Revit's failure handling rolls
+    a whole chunk back, its items are reported as failures too. Returns
+    (results, failures) where results are the values action returned and
+    failures are (item, message) pairs."""
+    results = []
+    failures = []
+    tg = TransactionGroup(doc, name)
+    tg.Start()
+    try:
+        for start in range(0, len(items), chunk_size):
+            t = Transaction(doc, name)
+            t.Start()
+            chunk = []
+            for item in items[start:start + chunk_size]:
+                st = SubTransaction(doc)
+                st.Start()
+                try:
+                    chunk.append((item, action(item)))
+                    st.Commit()
+                except Exception as e:
+                    st.RollBack()
+                    failures.append((item, str(e)))
+            status = t.Commit()
+            if status == TransactionStatus.Committed:
+                results.extend(result for _, result in chunk)
+            else:
+                failures.extend((item, "Rolled back by Revit ({}).".format(status)) for item, _ in chunk)
+        tg.Assimilate()
+    except:
+        tg.RollBack()
+        raise
+    return results, failures
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Wall helpers shared by the Dimension+ tools."""
+from Autodesk.Revit.DB import (BuiltInCategory, ElementCategoryFilter, ElementId, ElementIdSetFilter,
+                               FamilyInstance, FilteredElementCollector, GeometryInstance,
+                               LogicalOrFilter, Options, ViewDetailLevel, Wall, XYZ)
+from System.Collections.Generic import List
+
+from Geometry._framing import wall_frame
+from Geometry._spatial import WallEndpointIndex
+from Snippets._shared import get_shared, doc_key
+
+JOIN_TOLERANCE = 0.01  # ft
+
+
+def xyz_tuple(pt):
+    return (pt.X, pt.Y, pt.Z)
+
+
+def wall_curve(wall):
+    loc = wall.Location
+    curve = loc.Curve if hasattr(loc, 'Curve') else None
+    if curve is None or not curve.IsBound:
+        return None
+    return curve
+
+
+def curve_points(curve):
+    """Polyline through a location curve, tessellated for arcs."""
+    if curve.GetType().Name == "Line":
+        return [xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1))]
+    return [xyz_tuple(p) for p in curve.Tessellate()]
+
+
+def build_wall_index(walls):
+    index = WallEndpointIndex()
+    for w in walls:
+        curve = wall_curve(w)
+        if curve is None:
+            continue
+        index.add(w.Id.IntegerValue, xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1)))
+    return index
+
+
+def get_wall_index(doc, view):
+    """Endpoint index of the walls visible in view, built once per view.
+
+    Added, modified and deleted walls are applied by on_document_changed,
+    so a lookup never rescans the view."""
+    indexes = get_shared("WALL_INDEX", dict)
+    key = (doc_key(doc), view.Id.IntegerValue)
+    index = indexes.get(key)
+    if index is None:
+        walls = FilteredElementCollector(doc, view.Id).OfClass(Wall).WhereElementIsNotElementType()
+        index = build_wall_index(walls)
+        indexes[key] = index
+    return index
+
+
+def find_joined_walls(doc, view, wall, tolerance=JOIN_TOLERANCE, index=None):
+    """Walls in view with an endpoint touching wall's location curve.
+
+    index is the view's get_wall_index, resolved once by batch callers."""
+    curve = wall_curve(wall)
+    if curve is None:
+        return []
+    if index is None:
+        index = get_wall_index(doc, view)
+    # Tessellated arcs deviate from the true curve, so widen the index
+    # query and confirm each candidate against the curve itself.
+    search_tol = tolerance if curve.GetType().Name == "Line" else max(tolerance, 0.1)
+    keys = index.query_polyline(curve_points(curve), search_tol, exclude=wall.Id.IntegerValue)
+    joined = []
+    for key in sorted(keys):
+        other = doc.GetElement(ElementId(key))
+        other_curve = wall_curve(other) if isinstance(other, Wall) else None
+        if other_curve is None:
+            continue
+        if curve.Distance(other_curve.GetEndPoint(0)) < tolerance or curve.Distance(other_curve.GetEndPoint(1)) < tolerance:
+            joined.append(other)
+    return joined
+
+
+def inserts_by_host(doc, host_ids=None):
+    """Doors and windows grouped by host id, from a single collector.
+
+    host_ids optionally limits the result to those hosts (ElementIds or
+    integers). Returns {host id integer: [FamilyInstance, ...]}."""
+    wanted = None
+    if host_ids is not None:
+        wanted = set(h if isinstance(h, int) else h.IntegerValue for h in host_ids)
+    category_filter = LogicalOrFilter(ElementCategoryFilter(BuiltInCategory.OST_Doors),
+                                      ElementCategoryFilter(BuiltInCategory.OST_Windows))
+    grouped = {}
+    for inst in FilteredElementCollector(doc).OfClass(FamilyInstance).WherePasses(category_filter):
+        host = inst.Host
+        if host is None:
+            continue
+        key = host.Id.IntegerValue
+        if wanted is not None and key not in wanted:
+            continue
+        grouped.setdefault(key, []).append(inst)
+    return grouped
+
+
+def wall_frame_at(wall, point=None):
+    """Wall-local frame of wall, or None for walls without a bound curve.
+
+    Straight walls get one frame for their whole length. Curved walls are
+    framed on the tangent where point projects onto the location curve."""
+    curve = wall_curve(wall)
+    if curve is None:
+        return None
+    if curve.GetType().Name == "Line":
+        return wall_frame(xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1)))
+    if point is None:
+        return None
+    derivs = curve.ComputeDerivatives(curve.Project(point).Parameter, False)
+    return wall_frame(xyz_tuple(derivs.Origin), xyz_tuple(derivs.Origin + derivs.BasisX.Normalize()))
+
+
+def insert_box_corners(insert):
+    """World corners of an insert's box in its own family axes.
+
+    The symbol geometry box is taken through the instance transform, so it
+    follows the host wall at any angle. Falls back to the model bounding
+    box corners when the instance exposes no symbol geometry."""
+    options = Options()
+    options.DetailLevel = ViewDetailLevel.Coarse
+    box, transform = None, None
+    geometry = insert.get_Geometry(options)
+    if geometry is not None:
+        for obj in geometry:
+            if isinstance(obj, GeometryInstance):
+                box, transform = obj.GetSymbolGeometry().GetBoundingBox(), obj.Transform
+                break
+    if box is None:
+        box = insert.get_BoundingBox(None)
+        if box is None:
+            return None
+    corners = [XYZ(x, y, z) for x in (box.Min.X, box.Max.X)
+               for y in (box.Min.Y, box.Max.Y) for z in (box.Min.Z, box.Max.Z)]
+    if transform is not None:
+        corners = [transform.OfPoint(c) for c in corners]
+    return [xyz_tuple(c) for c in corners]
+
+
+def on_document_changed(args):
+    """Keep cached endpoint indexes in step with added, modified and deleted walls."""
+    doc = args.GetDocument()
+    indexes = get_shared("WALL_INDEX", dict)
+    key = doc_key(doc)
+    view_indexes = [(view_id, index) for (dkey, view_id), index in indexes.items() if dkey == key]
+    if not view_indexes:
+        return
+    doc_indexes = [index for _, index in view_indexes]
+    added = [eid for eid in args.GetAddedElementIds() if isinstance(doc.GetElement(eid), Wall)]
+    if added:
+        # Only the added walls are tested against each view's visibility
+        added_ids = List[ElementId](added)
+        for view_id, index in view_indexes:
+            try:
+                visible = FilteredElementCollector(doc, ElementId(view_id)).WherePasses(ElementIdSetFilter(added_ids))
+            except Exception:
+                continue  # view deleted
+            for wall in visible:
+                curve = wall_curve(wall)
+                if curve is not None:
+                    index.add(wall.Id.IntegerValue, xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1)))
+    for eid in args.GetDeletedElementIds():
+        for index in doc_indexes:
+            index.remove(eid.IntegerValue)
+    for eid in args.GetModifiedElementIds():
+        ikey = eid.IntegerValue
+        if not any(ikey in index for index in doc_indexes):
+            continue
+        wall = doc.GetElement(eid)
+        curve = wall_curve(wall) if isinstance(wall, Wall) else None
+        for index in doc_indexes:
+            if ikey not in index:
+                continue
+            if curve is None:
+                index.remove(ikey)
+            else:
+                index.add(ikey, xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1)))